@@ -4,6 +4,8 @@ Index - Local Knowledge Base with Semantic Search
 Entry point for the application.
 """
 
+import os
+
 import uvicorn
 
 from src.api import create_app
@@ -12,4 +14,13 @@ from src.api import create_app
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import string (not the app object) so uvicorn can fork workers;
+    # uvloop + httptools replace the default loop/parser for higher RPS
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -9,12 +9,16 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from ..config import settings
 from ..database import async_session, init_db, close_db
 from ..logging import setup_logging
 from ..providers.embedding import create_embedding_provider
+from ..providers.embedding.cache import configure_redis
+from ..providers.embedding.persistent import ChunkEmbedCache
 from ..providers.storage import create_storage_provider
 from ..services import KnowledgeService, SearchService, ChatService, ProgressService, GraphService
 from .routers import knowledge, chat, conversations, progress, graph
@@ -34,8 +38,24 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     logger.info("Database connected")
+
+    # Make sure the ANN index exists (no-op when init.sql already created it)
+    storage_provider = app.state.storage_provider
+    if hasattr(storage_provider, "ensure_index"):
+        try:
+            await storage_provider.ensure_index()
+        except Exception as e:
+            logger.warning(f"Vector index check failed: {e}")
     logger.info(f"Embedding: {settings.embedding.provider} / {settings.embedding.model}")
 
+    # Resolve unknown embedding dimensions now, not on the first request
+    embedding_provider = app.state.embedding_provider
+    if hasattr(embedding_provider, "probe_dimension"):
+        try:
+            await embedding_provider.probe_dimension()
+        except Exception as e:
+            logger.warning(f"Embedding dimension probe failed: {e}")
+
     # Neo4j
     graph_service: GraphService = app.state.graph_service
     try:
@@ -45,11 +65,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Neo4j unavailable: {e} (graph features disabled)")
 
+    # Optional Redis L2 cache (shared across workers)
+    redis_client = None
+    if settings.redis_url:
+        try:
+            import redis.asyncio as aioredis
+
+            redis_client = aioredis.from_url(settings.redis_url)
+            await redis_client.ping()
+            configure_redis(redis_client)
+            logger.info(f"Redis L2 cache connected: {settings.redis_url}")
+        except Exception as e:
+            redis_client = None
+            logger.warning(f"Redis unavailable: {e} (L2 cache disabled)")
+
     logger.info("API docs: http://localhost:8000/docs")
     yield
     # Shutdown
+    if redis_client is not None:
+        configure_redis(None)
+        await redis_client.aclose()
     await graph_service.close()
     await close_db()
+    embedding_provider = app.state.embedding_provider
+    if hasattr(embedding_provider, "aclose"):
+        await embedding_provider.aclose()
     logger.info("Database disconnected")
 
 
@@ -60,28 +100,43 @@ def create_app() -> FastAPI:
         description="Personal Learning Assistant",
         version="0.3.0",
         lifespan=lifespan,
+        # orjson serializes several times faster than json and handles
+        # datetime natively, so handlers can return raw datetime objects
+        default_response_class=ORJSONResponse,
     )
 
-    # CORS
+    # CORS — resolve settings once; the middleware holds plain values so no
+    # pydantic attribute lookups happen per request
+    cors_origins = list(settings.cors_origins)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=cors_origins,
         allow_methods=["*"],
         allow_headers=["*"],
     )
 
+    # Compress large JSON payloads (documents/conversations lists); small
+    # responses and the SSE stream are left alone
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
     # Providers
     embedding_provider = create_embedding_provider(
         provider=settings.embedding.provider,
         api_key=settings.embedding.api_key,
         base_url=settings.embedding.base_url,
         model=settings.embedding.model,
+        backend=settings.embedding.backend,
     )
+    # Store on app.state so lifespan can close its HTTP client
+    app.state.embedding_provider = embedding_provider
 
     storage_provider = create_storage_provider(
         provider="pgvector",
         session_factory=async_session,
+        ef_search=settings.hnsw_ef_search,
+        inmem_scan=settings.enable_inmem_scan,
     )
+    app.state.storage_provider = storage_provider
 
     # Services
     graph_service = GraphService(
@@ -93,6 +148,12 @@ def create_app() -> FastAPI:
     # Store on app.state so lifespan can access it
     app.state.graph_service = graph_service
 
+    embed_cache = (
+        ChunkEmbedCache(settings.embed_cache_path, model=settings.embedding.model)
+        if settings.embed_cache_path
+        else None
+    )
+
     knowledge_service = KnowledgeService(
         embedding_provider=embedding_provider,
         storage_provider=storage_provider,
@@ -100,6 +161,7 @@ def create_app() -> FastAPI:
         default_chunk_size=settings.chunk_size,
         default_chunk_overlap=settings.chunk_overlap,
         graph_service=graph_service,
+        embed_cache=embed_cache,
     )
 
     search_service = SearchService(
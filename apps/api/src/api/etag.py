@@ -0,0 +1,26 @@
+"""
+Weak ETag helpers for the list endpoints the SPA re-polls.
+
+The tag is derived from (max updated_at, row count) so any write changes it;
+matching If-None-Match requests short-circuit with an empty 304.
+"""
+
+from datetime import datetime
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+
+def list_etag(max_updated_at: datetime | None, total: int) -> str:
+    stamp = max_updated_at.timestamp() if max_updated_at else 0
+    return f'W/"{stamp}-{total}"'
+
+
+def etag_response(request: Request, payload: dict, etag: str) -> Response:
+    """Return 304 on an ETag match, else the payload with cache headers."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return ORJSONResponse(
+        payload,
+        headers={"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"},
+    )
@@ -26,6 +26,13 @@ def init_router(chat_service: ChatService) -> APIRouter:
                 message=request.message,
             ),
             media_type="text/event-stream",
+            # Disable proxy/browser buffering so tokens flush immediately;
+            # identity encoding keeps the gzip middleware off the token stream
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+                "Content-Encoding": "identity",
+            },
         )
 
     return router
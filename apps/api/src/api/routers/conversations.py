@@ -1,8 +1,11 @@
 """Conversations routes — CRUD for chat history."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...database import get_session
 from ...services import ChatService
+from ..etag import etag_response, list_etag
 
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
 
@@ -14,22 +17,25 @@ def init_router(chat_service: ChatService) -> APIRouter:
     async def create_conversation():
         """Create a new conversation."""
         conv = await chat_service.create_conversation()
-        return {"id": conv.id, "title": conv.title, "created_at": conv.created_at.isoformat()}
+        return {"id": conv.id, "title": conv.title, "created_at": conv.created_at}
 
     @router.get("")
     async def list_conversations(
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(20, ge=1, le=100),
+        session: AsyncSession = Depends(get_session),
     ):
         """List all conversations with pagination."""
-        result = await chat_service.list_conversations(page=page, size=size)
-        return {
+        result = await chat_service.list_conversations(page=page, size=size, session=session)
+        etag = list_etag(result["max_updated_at"], result["total"])
+        payload = {
             "items": [
                 {
                     "id": c.id,
                     "title": c.title,
-                    "created_at": c.created_at.isoformat() if c.created_at else None,
-                    "updated_at": c.updated_at.isoformat() if c.updated_at else None,
+                    "created_at": c.created_at,
+                    "updated_at": c.updated_at,
                 }
                 for c in result["items"]
             ],
@@ -37,24 +43,25 @@ def init_router(chat_service: ChatService) -> APIRouter:
             "page": result["page"],
             "size": result["size"],
         }
+        return etag_response(request, payload, etag)
 
     @router.get("/{conv_id}")
-    async def get_conversation(conv_id: str):
+    async def get_conversation(conv_id: str, session: AsyncSession = Depends(get_session)):
         """Get conversation with messages."""
-        data = await chat_service.get_conversation(conv_id)
+        data = await chat_service.get_conversation(conv_id, session=session)
         if not data:
             raise HTTPException(status_code=404, detail="Conversation not found")
         conv = data["conversation"]
         return {
             "id": conv.id,
             "title": conv.title,
-            "created_at": conv.created_at.isoformat() if conv.created_at else None,
+            "created_at": conv.created_at,
             "messages": [
                 {
                     "id": m.id,
                     "role": m.role,
                     "content": m.content,
-                    "created_at": m.created_at.isoformat() if m.created_at else None,
+                    "created_at": m.created_at,
                 }
                 for m in data["messages"]
             ],
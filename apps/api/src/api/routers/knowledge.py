@@ -3,18 +3,19 @@
 import os
 from pathlib import Path
 
-from fastapi import APIRouter, Form, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Request, UploadFile, File
+from fastapi.responses import FileResponse, ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...database import get_session
 from ...services import KnowledgeService, SearchService
+from ..etag import etag_response, list_etag
 from ...providers.parser.file_extractor import extract_text, get_file_type, SUPPORTED_EXTENSIONS
 from ..models import (
     IndexRequest,
     IndexResponse,
     SearchRequest,
     SearchResponse,
-    SearchResultItem,
-    DocumentResponse,
     DocumentsResponse,
     StatsResponse,
     DeleteResponse,
@@ -44,19 +45,32 @@ def init_router(
         )
 
     @router.post("/index", response_model=IndexResponse)
-    async def index_document(request: IndexRequest):
-        """Index a document for semantic search."""
-        result = await knowledge_service.index_document(
-            content=request.content,
-            source=request.source or "unknown",
-            metadata=request.metadata,
-            file_type=request.file_type or "text",
+    async def index_document(request: IndexRequest, background: BackgroundTasks):
+        """Index a document for semantic search.
+
+        Responds immediately; chunking/embedding runs as a background task and
+        progress is visible via the document's status field.
+        """
+        source = request.source or "unknown"
+        file_type = request.file_type or "text"
+        doc_id = await knowledge_service.create_document(
+            source=source,
+            file_type=file_type,
+            content_size=len(request.content.encode()),
+        )
+        background.add_task(
+            knowledge_service.index_document_background,
+            doc_id,
+            request.content,
+            source,
+            request.metadata,
+            file_type,
         )
         return IndexResponse(
-            success=result.success,
-            doc_id=result.doc_id,
-            chunks_count=result.chunks_count,
-            message=result.message,
+            success=True,
+            doc_id=doc_id,
+            chunks_count=0,
+            message="Indexing started",
         )
 
     @router.post("/search", response_model=SearchResponse)
@@ -66,37 +80,49 @@ def init_router(
             query=request.query,
             top_k=request.top_k or 5,
         )
-        return SearchResponse(
-            results=[
-                SearchResultItem(
-                    content=r.content,
-                    source=r.source,
-                    score=r.score,
-                    metadata=r.metadata,
-                )
-                for r in results
-            ],
-            total=len(results),
+        # Returning a Response bypasses response_model re-validation (which
+        # would otherwise re-check every item); fields come straight from
+        # the service layer and are already well-typed. response_model stays
+        # for the OpenAPI schema.
+        return ORJSONResponse(
+            {
+                "results": [
+                    {
+                        "content": r.content,
+                        "source": r.source,
+                        "score": r.score,
+                        "metadata": r.metadata,
+                    }
+                    for r in results
+                ],
+                "total": len(results),
+            }
         )
 
     @router.get("/documents", response_model=DocumentsResponse)
-    async def list_documents():
+    async def list_documents(request: Request, session: AsyncSession = Depends(get_session)):
         """List all indexed documents."""
-        documents = await knowledge_service.list_documents()
-        return DocumentsResponse(
-            documents=[
-                DocumentResponse(
-                    id=doc.id,
-                    filename=doc.filename,
-                    source=doc.source or "",
-                    status=doc.status,
-                    chunk_count=doc.chunk_count,
-                    created_at=doc.created_at.isoformat() if doc.created_at else "",
-                )
+        documents = await knowledge_service.list_documents(session=session)
+        max_updated_at = max(
+            (doc.updated_at for doc in documents if doc.updated_at), default=None
+        )
+        etag = list_etag(max_updated_at, len(documents))
+        payload = {
+            "documents": [
+                {
+                    "id": doc.id,
+                    "filename": doc.filename,
+                    "source": doc.source or "",
+                    "status": doc.status,
+                    "chunk_count": doc.chunk_count,
+                    # orjson serializes datetime natively; no per-row isoformat
+                    "created_at": doc.created_at or "",
+                }
                 for doc in documents
             ],
-            total=len(documents),
-        )
+            "total": len(documents),
+        }
+        return etag_response(request, payload, etag)
 
     @router.delete("/documents/{doc_id}", response_model=DeleteResponse)
     async def delete_document(doc_id: str):
@@ -1,9 +1,12 @@
 """Learning progress routes — CRUD for reading items with percentage progress."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...database import get_session
 from ...services import ProgressService, KnowledgeService
+from ..etag import etag_response, list_etag
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
@@ -39,12 +42,15 @@ def init_router(progress_service: ProgressService, knowledge_service: KnowledgeS
 
     @router.get("")
     async def list_items(
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(20, ge=1, le=100),
+        session: AsyncSession = Depends(get_session),
     ):
         """List learning items with pagination."""
-        result = await progress_service.list_items(page=page, size=size)
-        return {
+        result = await progress_service.list_items(page=page, size=size, session=session)
+        etag = list_etag(result["max_updated_at"], result["total"])
+        payload = {
             "items": [
                 {
                     "id": i.id,
@@ -54,19 +60,21 @@ def init_router(progress_service: ProgressService, knowledge_service: KnowledgeS
                     "progress": i.progress,
                     "status": i.status,
                     "document_id": i.document_id,
-                    "updated_at": i.updated_at.isoformat() if i.updated_at else None,
+                    "updated_at": i.updated_at,
                 }
                 for i in result["items"]
             ],
             "total": result["total"],
+            "completed": result["completed"],
             "page": result["page"],
             "size": result["size"],
         }
+        return etag_response(request, payload, etag)
 
     @router.get("/{item_id}")
-    async def get_item(item_id: str):
+    async def get_item(item_id: str, session: AsyncSession = Depends(get_session)):
         """Get a learning item."""
-        item = await progress_service.get_item(item_id)
+        item = await progress_service.get_item(item_id, session=session)
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
         return {
@@ -79,7 +87,7 @@ def init_router(progress_service: ProgressService, knowledge_service: KnowledgeS
             "notes": item.notes,
             "document_id": item.document_id,
             "filename": item.document.filename if item.document else None,
-            "updated_at": item.updated_at.isoformat() if item.updated_at else None,
+            "updated_at": item.updated_at,
         }
 
     @router.put("/{item_id}")
@@ -2,14 +2,35 @@
 SQLAlchemy async engine and session management.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
+from loguru import logger
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
 from .config import settings
 
-engine = create_async_engine(settings.database.url, pool_size=5, max_overflow=10)
+POOL_SIZE = 10
+
+engine = create_async_engine(
+    settings.database.url,
+    pool_size=POOL_SIZE,
+    max_overflow=20,
+    # Each forked uvicorn worker gets its own pool; pre-ping revalidates
+    # connections so stale ones inherited across fork/restart are replaced
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # Larger compiled-statement cache: the app reuses a small set of ORM
+    # queries, so recompilation should never show up on the hot path
+    query_cache_size=1200,
+    # Server-side prepared statements for repeated ORM queries (asyncpg)
+    connect_args={"prepared_statement_cache_size": 1024},
+)
 
-async_session = async_sessionmaker(engine, expire_on_commit=False)
+# autoflush off: endpoints are read-only or single-write, no interleaved flushes
+async_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 
 class Base(DeclarativeBase):
@@ -22,9 +43,32 @@ async def get_session() -> AsyncSession:
         yield session
 
 
+@asynccontextmanager
+async def session_scope(session_factory: async_sessionmaker, session: AsyncSession | None = None):
+    """Yield the request-scoped session if given, else open one from the factory.
+
+    Lets service methods accept an injected session (Depends(get_session))
+    without breaking callers that rely on the factory.
+    """
+    if session is not None:
+        yield session
+    else:
+        async with session_factory() as new_session:
+            yield new_session
+
+
 async def init_db():
-    """Initialize database connection (called at startup)."""
-    pass
+    """Pre-warm the connection pool so first requests skip connect+TLS setup."""
+
+    async def _warm():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        # Concurrent so the pool actually opens POOL_SIZE distinct connections
+        await asyncio.gather(*(_warm() for _ in range(POOL_SIZE)))
+    except Exception as e:
+        logger.warning(f"Connection pool pre-warm failed: {e}")
 
 
 async def close_db():
@@ -5,6 +5,7 @@ Embedding providers package.
 from .base import EmbeddingProvider
 from .openai import OpenAIEmbeddingProvider
 from .local import LocalEmbeddingProvider
+from .threaded import ThreadedEmbeddingProvider
 
 
 def create_embedding_provider(
@@ -12,6 +13,7 @@ def create_embedding_provider(
     api_key: str | None = None,
     base_url: str | None = None,
     model: str | None = None,
+    backend: str = "torch",
 ) -> EmbeddingProvider:
     """
     Factory function to create embedding provider.
@@ -21,6 +23,7 @@ def create_embedding_provider(
         api_key: API key for remote providers
         base_url: Base URL for API
         model: Model name
+        backend: Local inference backend ("torch" or "onnx")
 
     Returns:
         EmbeddingProvider instance
@@ -42,7 +45,11 @@ def create_embedding_provider(
             model=model or default_model,
         )
     elif provider == "local":
-        return LocalEmbeddingProvider(model=model or "all-MiniLM-L6-v2")
+        # Inference is CPU-bound — run it on a dedicated thread so it never
+        # blocks the event loop (single worker avoids torch thread contention)
+        return ThreadedEmbeddingProvider(
+            LocalEmbeddingProvider(model=model or "all-MiniLM-L6-v2", backend=backend)
+        )
     else:
         raise ValueError(f"Unknown embedding provider: {provider}")
 
@@ -51,5 +58,6 @@ __all__ = [
     "EmbeddingProvider",
     "OpenAIEmbeddingProvider",
     "LocalEmbeddingProvider",
+    "ThreadedEmbeddingProvider",
     "create_embedding_provider",
 ]
@@ -0,0 +1,74 @@
+"""
+Dynamic micro-batching for concurrent embedding requests.
+
+Under chat/RAG load many coroutines call embed() with a single text each,
+paying one API round-trip per query. The batcher coalesces pending calls
+within a short window (max_wait_ms, or until max_batch texts are queued)
+into a single API call and fans the results back out via per-caller futures.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+class DynamicBatcher:
+    """Coalesces single-text embed() calls into batched API calls."""
+
+    def __init__(
+        self,
+        flush: Callable[[list[str]], Awaitable[list[list[float]]]],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._flush = flush
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue()
+        # Started lazily so the batcher binds to the running event loop
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, text: str) -> list[float]:
+        """Queue a text for embedding and wait for its result."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            # Block for the first item, then drain for up to max_wait
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self._max_wait
+
+            while len(batch) < self._max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await self._flush(texts)
+                for (_, future), embedding in zip(batch, embeddings):
+                    if not future.done():
+                        future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def aclose(self) -> None:
+        """Stop the background worker (called at app shutdown)."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,227 @@
+"""
+Caching for the embedding/search hot path.
+
+Two layers:
+- AsyncLRU: exact-text embedding cache keyed by SHA256 of the input text.
+  Skips the embedding API round-trip entirely for repeated queries.
+- SemanticCache: random-projection LSH over query vectors. Near-identical
+  queries (cosine >= threshold) reuse the previously retrieved result list,
+  skipping the vector search as well.
+
+Writes to the knowledge base invalidate the semantic layer via a module-level
+epoch counter: the epoch is part of every bucket key, so bumping it makes all
+existing entries unreachable without an explicit flush.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import orjson
+from loguru import logger
+
+# Monotonic epoch, bumped on every knowledge-base write (index/delete).
+_epoch: int = 0
+
+# Optional Redis client for the shared L2 layer (see configure_redis).
+_redis: Any = None
+
+EMBEDDING_TTL = 7 * 24 * 3600  # embeddings are content-addressed, keep long
+SEARCH_TTL = 300  # search results go stale with writes, keep short
+
+
+def bump_epoch() -> None:
+    """Invalidate all semantic cache entries (called on index/delete)."""
+    global _epoch
+    _epoch += 1
+    if _redis is not None:
+        # Shared epoch makes the invalidation visible to all workers; O(1)
+        # instead of SCAN+UNLINK over search:* keys
+        try:
+            asyncio.get_running_loop().create_task(_bump_redis_epoch())
+        except RuntimeError:
+            pass  # no running loop (e.g. scripts) — local epoch still bumped
+
+
+async def _bump_redis_epoch() -> None:
+    try:
+        await _redis.incr("search:epoch")
+    except Exception as e:
+        logger.warning(f"Redis epoch bump failed: {e}")
+
+
+def current_epoch() -> int:
+    return _epoch
+
+
+def text_key(text: str) -> str:
+    """Stable cache key for a piece of text."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def configure_redis(client: Any) -> None:
+    """Enable the shared L2 cache (redis.asyncio client, or None to disable).
+
+    With multiple uvicorn workers each in-process L1 is cold for queries a
+    peer just answered; Redis shares embeddings and top-k search payloads
+    across them. All L2 operations degrade to a miss on any Redis error.
+    """
+    global _redis
+    _redis = client
+
+
+async def l2_get_embedding(key: str) -> list[float] | None:
+    """Fetch an embedding from Redis (stored as fp16 bytes)."""
+    if _redis is None:
+        return None
+    try:
+        raw = await _redis.get(f"emb:{key}")
+    except Exception as e:
+        logger.warning(f"Redis get failed: {e}")
+        return None
+    if raw is None:
+        return None
+    return np.frombuffer(raw, dtype=np.float16).astype(float).tolist()
+
+
+async def l2_put_embedding(key: str, embedding: list[float]) -> None:
+    if _redis is None:
+        return
+    try:
+        value = np.asarray(embedding, dtype=np.float16).tobytes()
+        await _redis.setex(f"emb:{key}", EMBEDDING_TTL, value)
+    except Exception as e:
+        logger.warning(f"Redis set failed: {e}")
+
+
+async def l2_get_search(key: str) -> list[dict] | None:
+    """Fetch a cached top-k result payload (list of plain dicts)."""
+    if _redis is None:
+        return None
+    try:
+        epoch = await _redis.get("search:epoch") or b"0"
+        raw = await _redis.get(f"search:{epoch.decode()}:{key}")
+    except Exception as e:
+        logger.warning(f"Redis get failed: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def l2_put_search(key: str, items: list[dict]) -> None:
+    if _redis is None:
+        return
+    try:
+        epoch = await _redis.get("search:epoch") or b"0"
+        await _redis.setex(f"search:{epoch.decode()}:{key}", SEARCH_TTL, orjson.dumps(items))
+    except Exception as e:
+        logger.warning(f"Redis set failed: {e}")
+
+
+class AsyncLRU:
+    """
+    Simple LRU cache for embeddings, safe for single-event-loop use.
+
+    Keys are SHA256 hex digests of the input text (see text_key).
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    LSH-based cache mapping query vectors to retrieved result lists.
+
+    Uses random-projection hashing: each of n_tables tables projects the
+    query onto n_bits random hyperplanes and packs the signs into a bucket
+    key. A lookup probes all tables and verifies candidates with an exact
+    cosine check against the stored query vector.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        n_tables: int = 8,
+        n_bits: int = 12,
+        threshold: float = 0.95,
+        maxsize: int = 256,
+    ):
+        self._threshold = threshold
+        self._maxsize = maxsize
+        self._n_tables = n_tables
+        self._n_bits = n_bits
+        rng = np.random.default_rng(seed=0)
+        # All tables stacked into one matrix: signatures for every table come
+        # out of a single BLAS matmul instead of n_tables small ones
+        self._planes = rng.standard_normal((n_tables * n_bits, dimension)).astype(
+            "float32"
+        )
+        # bucket key -> list of entry ids
+        self._buckets: dict[tuple, list[int]] = {}
+        # entry id -> (normalized query vector, cached results)
+        self._entries: OrderedDict[int, tuple[np.ndarray, Any]] = OrderedDict()
+        self._next_id = 0
+
+    def _signatures(self, vector: np.ndarray) -> list[tuple]:
+        bits = (self._planes @ vector > 0).reshape(self._n_tables, self._n_bits)
+        packed = np.packbits(bits, axis=1)
+        epoch = current_epoch()
+        return [(epoch, i, packed[i].tobytes()) for i in range(self._n_tables)]
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype="float32")
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, query_embedding: list[float]) -> Any | None:
+        """Return cached results for a near-identical query, or None."""
+        vector = self._normalize(query_embedding)
+        seen: set[int] = set()
+        for signature in self._signatures(vector):
+            for entry_id in self._buckets.get(signature, ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                stored_vector, results = entry
+                if float(stored_vector @ vector) >= self._threshold:
+                    self._entries.move_to_end(entry_id)
+                    return results
+        return None
+
+    def put(self, query_embedding: list[float], results: Any) -> None:
+        """Store results under the query's LSH buckets."""
+        vector = self._normalize(query_embedding)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (vector, results)
+        for signature in self._signatures(vector):
+            self._buckets.setdefault(signature, []).append(entry_id)
+
+        # Evict oldest entries; bucket lists are cleaned lazily on lookup
+        while len(self._entries) > self._maxsize:
+            old_id, _ = self._entries.popitem(last=False)
+            for ids in self._buckets.values():
+                if old_id in ids:
+                    ids.remove(old_id)
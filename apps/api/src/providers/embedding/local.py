@@ -3,7 +3,6 @@ Local embedding provider using sentence-transformers.
 """
 
 import asyncio
-from functools import partial
 
 from .base import EmbeddingProvider
 
@@ -15,25 +14,41 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     Supports any model from HuggingFace that works with sentence-transformers.
     """
 
-    def __init__(self, model: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model: str = "all-MiniLM-L6-v2", backend: str = "torch"):
         self._model_name = model
+        self._backend = backend
         self._model = None
         self._dimension: int | None = None
 
     def _load_model(self):
-        """Lazy load the model."""
+        """Lazy load the model.
+
+        backend="onnx" loads through sentence-transformers' ONNX runtime
+        (2-4x on CPU). On the default torch backend, a CUDA device gets the
+        model in fp16 — half the memory bandwidth, and cosine ranking is
+        robust to the precision loss.
+        """
         if self._model is None:
             try:
                 from sentence_transformers import SentenceTransformer
-
-                self._model = SentenceTransformer(self._model_name)
-                # Get dimension from model
-                self._dimension = self._model.get_sentence_embedding_dimension()
             except ImportError:
                 raise RuntimeError(
                     "Local embedding requires sentence-transformers. "
                     "Install with: pip install sentence-transformers"
                 )
+
+            kwargs = {"backend": "onnx"} if self._backend == "onnx" else {}
+            self._model = SentenceTransformer(self._model_name, **kwargs)
+            if self._backend != "onnx":
+                try:
+                    import torch
+
+                    if torch.cuda.is_available():
+                        self._model = self._model.half().to("cuda")
+                except ImportError:
+                    pass
+            # Get dimension from model
+            self._dimension = self._model.get_sentence_embedding_dimension()
         return self._model
 
     @property
@@ -46,26 +61,43 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             self._load_model()
         return self._dimension  # type: ignore
 
+    def encode_sync(self, texts: list[str]) -> list[list[float]]:
+        """Synchronous encode — the CPU-bound core, callable from an executor.
+
+        Texts are sorted by length before encoding: the transformer pads
+        every sequence in a batch to its longest member, so mixing lengths
+        wastes compute on padding tokens. The permutation is inverted on the
+        way out, so callers see arrival order.
+        """
+        model = self._load_model()
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = model.encode(
+            [texts[i] for i in order],
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        out: list[list[float] | None] = [None] * len(texts)
+        for pos, i in enumerate(order):
+            out[i] = embeddings[pos].tolist()
+        return out  # type: ignore[return-value]
+
     async def embed(self, text: str) -> list[float]:
         """Generate embedding for a single text."""
-        if not text or not text.strip():
+        text = text.strip() if text else ""
+        if not text:
             raise ValueError("Text cannot be empty")
 
-        model = self._load_model()
-        loop = asyncio.get_event_loop()
-        embedding = await loop.run_in_executor(None, partial(model.encode, [text.strip()]))
-        return embedding[0].tolist()
+        embeddings = await asyncio.to_thread(self.encode_sync, [text])
+        return embeddings[0]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts."""
         if not texts:
             return []
 
-        valid_texts = [t.strip() for t in texts if t and t.strip()]
+        # Single strip pass per text (strip once, keep non-blank results)
+        valid_texts = [s for t in texts if t and (s := t.strip())]
         if not valid_texts:
             return []
 
-        model = self._load_model()
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(None, partial(model.encode, valid_texts))
-        return [emb.tolist() for emb in embeddings]
+        return await asyncio.to_thread(self.encode_sync, valid_texts)
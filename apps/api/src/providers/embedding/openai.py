@@ -4,9 +4,16 @@ OpenAI-compatible embedding provider.
 Works with OpenAI, SiliconFlow, and other OpenAI-compatible APIs.
 """
 
+import asyncio
+import types
+
 import httpx
+import numpy as np
+import orjson
 
 from .base import EmbeddingProvider
+from .batcher import DynamicBatcher
+from .cache import AsyncLRU, l2_get_embedding, l2_put_embedding, text_key
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -16,8 +23,8 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     Supports OpenAI, SiliconFlow, Azure OpenAI, and other compatible APIs.
     """
 
-    # Known model dimensions
-    MODEL_DIMENSIONS = {
+    # Known model dimensions (read-only — looked up once in __init__)
+    MODEL_DIMENSIONS = types.MappingProxyType({
         # OpenAI
         "text-embedding-3-small": 1536,
         "text-embedding-3-large": 3072,
@@ -31,7 +38,11 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         "voyage-3.5-lite": 1024,
         "voyage-3-large": 1024,
         "voyage-code-3": 1024,
-    }
+    })
+
+    # Concurrent in-flight batch requests and retry attempts per call
+    API_CONCURRENCY = 8
+    API_RETRIES = 3
 
     def __init__(
         self,
@@ -39,12 +50,59 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         base_url: str = "https://api.openai.com/v1",
         model: str = "text-embedding-3-small",
         timeout: float = 30.0,
+        client: httpx.AsyncClient | None = None,
     ):
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
         self._model = model
         self._timeout = timeout
         self._dimension: int | None = self.MODEL_DIMENSIONS.get(model)
+        self._cache = AsyncLRU(maxsize=1024)
+        self._batcher = DynamicBatcher(flush=self._call_api)
+        # Singleflight: concurrent embed() calls for the same text share one
+        # in-flight request instead of issuing duplicates
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Injectable for tests / sharing; otherwise created lazily so it
+        # binds to the running event loop. Injected clients are not closed
+        # by aclose() — their owner manages their lifecycle.
+        self._client = client
+        self._owns_client = client is None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Lazily create a long-lived client with keep-alive + HTTP/2.
+
+        Reusing connections amortizes the TCP+TLS handshake across requests,
+        and HTTP/2 multiplexes concurrent embedding calls over one connection.
+        """
+        if self._client is None or self._client.is_closed:
+            self._owns_client = True
+            # With an explicit transport, http2/limits belong on the
+            # transport; retries=3 covers connect-level failures (DNS,
+            # resets) while _call_api handles 429/5xx statuses
+            transport = httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                transport=transport,
+                headers={
+                    "Authorization": f"Bearer {self._api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the batcher and HTTP client (called at app shutdown)."""
+        await self._batcher.aclose()
+        if self._owns_client and self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
 
     @property
     def model_name(self) -> str:
@@ -55,17 +113,63 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         if self._dimension is None:
             raise ValueError(
                 f"Unknown dimension for model {self._model}. "
-                "Call embed() first to auto-detect."
+                "Call probe_dimension() first to auto-detect."
             )
         return self._dimension
 
+    async def probe_dimension(self) -> int:
+        """Resolve the dimension for unknown models with one probe call.
+
+        Invoked at startup so the first real request doesn't pay for
+        discovery, and _call_api stays branch-free.
+        """
+        if self._dimension is None:
+            embeddings = await self._call_api(["dimension probe"])
+            self._dimension = len(embeddings[0])
+        return self._dimension
+
     async def embed(self, text: str) -> list[float]:
         """Generate embedding for a single text."""
-        if not text or not text.strip():
+        text = text.strip() if text else ""
+        if not text:
             raise ValueError("Text cannot be empty")
-
-        embeddings = await self._call_api([text.strip()])
-        return embeddings[0]
+        key = text_key(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Duplicate of an in-flight request: wait for its result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            # Shared L2 (Redis) — may have been embedded by a peer worker
+            embedding = await l2_get_embedding(key)
+            if embedding is None:
+                # Coalesce concurrent single-text calls into one API request
+                embedding = await self._batcher.submit(text)
+                await l2_put_embedding(key, embedding)
+            self._cache.put(key, embedding)
+            if not future.cancelled():
+                future.set_result(embedding)
+        except Exception as e:
+            if not future.cancelled():
+                future.set_exception(e)
+                # Avoid "exception never retrieved" if nobody else awaited
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            # If the owning caller was cancelled (e.g. SSE disconnect) the
+            # future is still pending here; cancel it so coalesced waiters
+            # blocked on it don't hang forever
+            if not future.done():
+                future.cancel()
+
+        return embedding
 
     async def embed_batch(
         self, texts: list[str], batch_size: int = 128
@@ -74,44 +178,62 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         if not texts:
             return []
 
-        valid_texts = [t.strip() for t in texts if t and t.strip()]
+        valid_texts = [s for t in texts if t and (s := t.strip())]
         if not valid_texts:
             return []
 
-        # Single batch — fast path
-        if len(valid_texts) <= batch_size:
-            return await self._call_api(valid_texts)
-
-        # Split into batches to stay within API per-request limits
-        all_embeddings: list[list[float]] = []
-        for i in range(0, len(valid_texts), batch_size):
-            batch = valid_texts[i : i + batch_size]
-            embeddings = await self._call_api(batch)
-            all_embeddings.extend(embeddings)
-        return all_embeddings
+        # Serve already-embedded texts from cache, only call the API for misses
+        keys = [text_key(t) for t in valid_texts]
+        results: list[list[float] | None] = [self._cache.get(k) for k in keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+
+        if missing:
+            missing_texts = [valid_texts[i] for i in missing]
+            # Dispatch the per-request slices concurrently (bounded by a
+            # semaphore) instead of serially — large documents see near-linear
+            # speedup up to the provider's rate limit. gather preserves order,
+            # so flattening realigns with `missing`.
+            slices = [
+                missing_texts[start : start + batch_size]
+                for start in range(0, len(missing_texts), batch_size)
+            ]
+            sem = asyncio.Semaphore(self.API_CONCURRENCY)
+
+            async def call_one(batch: list[str]) -> list[list[float]]:
+                async with sem:
+                    return await self._call_api(batch)
+
+            batches = await asyncio.gather(*(call_one(s) for s in slices))
+            embeddings = [emb for batch in batches for emb in batch]
+            for i, emb in zip(missing, embeddings):
+                results[i] = emb
+                self._cache.put(keys[i], emb)
+
+        return results  # type: ignore[return-value]
 
     async def _call_api(self, texts: list[str]) -> list[list[float]]:
-        """Call the embedding API."""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        """Call the embedding API, retrying 429/5xx with exponential backoff."""
+        client = self._get_client()
+        for attempt in range(self.API_RETRIES):
             response = await client.post(
                 f"{self._base_url}/embeddings",
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
                 json={"model": self._model, "input": texts},
             )
+            if (
+                response.status_code in (429,) or response.status_code >= 500
+            ) and attempt + 1 < self.API_RETRIES:
+                await asyncio.sleep(0.5 * 2**attempt)
+                continue
+            break
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Embedding API error ({response.status_code}): {response.text}"
+            )
 
-            if response.status_code != 200:
-                raise RuntimeError(
-                    f"Embedding API error ({response.status_code}): {response.text}"
-                )
-
-            data = response.json()
-            embeddings = [item["embedding"] for item in data["data"]]
-
-            # Auto-detect dimension
-            if self._dimension is None and embeddings:
-                self._dimension = len(embeddings[0])
-
-            return embeddings
+        # orjson parses the float-heavy payload faster than httpx's stdlib json
+        data = orjson.loads(response.content)
+        raw = [item["embedding"] for item in data["data"]]
+        # Single vectorized fp16 pass (rather than per-vector) so storing into
+        # the halfvec column needs no precision-losing cast on the Postgres side
+        return np.asarray(raw, dtype=np.float16).tolist() if raw else []
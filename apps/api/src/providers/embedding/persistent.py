@@ -0,0 +1,66 @@
+"""
+Persistent chunk-embedding cache backed by SQLite.
+
+Knowledge-base refresh loops re-ingest mostly unchanged documents; without a
+durable cache every chunk is re-embedded on each pass. This side-table maps
+blake2b(model + chunk text) to the vector (packed fp16 — half the disk
+footprint), so only genuinely new or edited chunks hit the embedding backend.
+
+All methods are synchronous sqlite3 calls; callers on the event loop should
+dispatch them via asyncio.to_thread.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+
+class ChunkEmbedCache:
+    """Durable text-hash → embedding store (WAL-mode SQLite)."""
+
+    def __init__(self, path: str, model: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: accessed from to_thread worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._model = model
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "hash BLOB PRIMARY KEY, dim INTEGER NOT NULL, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        # Salting with the model name invalidates entries on model change
+        return hashlib.blake2b(
+            f"{self._model}\x00{text}".encode(), digest_size=16
+        ).digest()
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up embeddings for texts; None where not cached."""
+        keys = [self._key(t) for t in texts]
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT hash, vec FROM chunks WHERE hash IN ({placeholders})", keys
+        ).fetchall()
+        found = {
+            h: np.frombuffer(v, dtype=np.float16).astype(float).tolist()
+            for h, v in rows
+        }
+        return [found.get(k) for k in keys]
+
+    def put_many(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        """Store embeddings (fp16-packed); existing hashes are left untouched."""
+        rows = [
+            (self._key(t), len(e), np.asarray(e, dtype=np.float16).tobytes())
+            for t, e in zip(texts, embeddings)
+        ]
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO chunks (hash, dim, vec) VALUES (?, ?, ?)", rows
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,92 @@
+"""
+Thread-pool wrapper for CPU-bound embedding providers.
+
+LocalEmbeddingProvider runs sentence-transformers inference on the CPU; if it
+shared the default executor with other blocking work (or worse, ran inline),
+a single encode would stall every request on the event loop. The wrapper
+dispatches embed/embed_batch onto a dedicated single-worker executor — one
+worker avoids PyTorch intra-op thread contention, and torch's own threading
+handles parallelism within a batch.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import EmbeddingProvider
+from .batcher import DynamicBatcher
+from .cache import AsyncLRU, text_key
+from .local import LocalEmbeddingProvider
+
+
+class ThreadedEmbeddingProvider(EmbeddingProvider):
+    """Runs a CPU-bound local provider on a dedicated thread pool."""
+
+    def __init__(self, provider: LocalEmbeddingProvider, max_workers: int = 1):
+        self._provider = provider
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="embedding"
+        )
+        # Concurrent single-text embed() calls coalesce into one encode —
+        # the model batches far better than N sequential length-1 calls
+        self._batcher = DynamicBatcher(flush=self._encode_on_executor)
+        # Content-hash cache: repeat queries skip the encoder entirely
+        # (mirrors the API provider's cache)
+        self._cache = AsyncLRU(maxsize=4096)
+        # Let torch parallelize within the single inference thread
+        try:
+            import torch
+
+            torch.set_num_threads(os.cpu_count() or 1)
+        except ImportError:
+            pass
+
+    async def _encode_on_executor(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._provider.encode_sync, texts
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._provider.model_name
+
+    @property
+    def dimension(self) -> int:
+        return self._provider.dimension
+
+    async def embed(self, text: str) -> list[float]:
+        text = text.strip() if text else ""
+        if not text:
+            raise ValueError("Text cannot be empty")
+        key = text_key(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = await self._batcher.submit(text)
+        self._cache.put(key, embedding)
+        return embedding
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        valid_texts = [s for t in texts if t and (s := t.strip())]
+        if not valid_texts:
+            return []
+
+        # Encode only cache misses and splice the results back in order
+        keys = [text_key(t) for t in valid_texts]
+        results: list[list[float] | None] = [self._cache.get(k) for k in keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            embeddings = await self._encode_on_executor(
+                [valid_texts[i] for i in missing]
+            )
+            for i, emb in zip(missing, embeddings):
+                results[i] = emb
+                self._cache.put(keys[i], emb)
+        return results  # type: ignore[return-value]
+
+    async def aclose(self) -> None:
+        """Shut down the batcher and executor (called at app shutdown)."""
+        await self._batcher.aclose()
+        self._executor.shutdown(wait=False, cancel_futures=True)
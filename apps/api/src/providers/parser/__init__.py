@@ -2,11 +2,21 @@
 Parser providers package.
 """
 
+from functools import lru_cache
+
 from .base import ParserProvider, ParsedDocument, Chunk
 from .text import TextParser
 from .markdown import MarkdownParser
 
+# file_type → parser class; unknown types fall back to plain text
+_PARSER_CLASSES: dict[str, type[ParserProvider]] = {
+    "text": TextParser,
+    "markdown": MarkdownParser,
+    "md": MarkdownParser,
+}
+
 
+@lru_cache(maxsize=8)
 def create_parser(
     file_type: str = "text",
     chunk_size: int = 500,
@@ -15,6 +25,10 @@ def create_parser(
     """
     Factory function to create parser provider.
 
+    Parsers hold no per-document state (only chunk_size/chunk_overlap), so
+    instances are cached per argument tuple and shared across calls instead
+    of being reallocated on every indexed document.
+
     Args:
         file_type: File type ("text", "markdown", "md")
         chunk_size: Size of each chunk
@@ -23,13 +37,8 @@ def create_parser(
     Returns:
         ParserProvider instance
     """
-    if file_type == "text":
-        return TextParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    elif file_type in ("markdown", "md"):
-        return MarkdownParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    else:
-        # Default to text parser
-        return TextParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    parser_cls = _PARSER_CLASSES.get(file_type, TextParser)
+    return parser_cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
 
 __all__ = [
@@ -7,7 +7,7 @@ Images are processed via Claude Vision API.
 
 import csv
 import io
-import json
+import orjson
 from pathlib import Path
 
 # extension → (parser_type_for_chunking, category)
@@ -46,6 +46,8 @@ _ANTHROPIC_MEDIA_TYPES: dict[str, str] = {
 }
 # Formats that need Pillow conversion → PNG before sending to Claude
 _NEEDS_CONVERSION = {".bmp", ".tiff", ".tif"}
+# Formats that decode straight to text with no extractor library
+_PLAIN_TEXT_EXTENSIONS = {".txt", ".md", ".markdown"}
 
 IMAGE_EXTENSIONS = set(_ANTHROPIC_MEDIA_TYPES) | _NEEDS_CONVERSION
 
@@ -76,7 +78,7 @@ async def extract_text(
     if parser_type is None:
         raise ValueError(f"Unsupported file type: {ext!r}")
 
-    if ext in (".txt", ".md", ".markdown"):
+    if ext in _PLAIN_TEXT_EXTENSIONS:
         text = data.decode("utf-8", errors="replace")
     elif ext == ".pdf":
         if high_quality:
@@ -247,7 +249,7 @@ def _excel(data: bytes, ext: str) -> str:
 
 
 def _notebook(data: bytes) -> str:
-    nb = json.loads(data.decode("utf-8", errors="replace"))
+    nb = orjson.loads(data.decode("utf-8", errors="replace"))
     parts: list[str] = []
     for cell in nb.get("cells", []):
         source = "".join(cell.get("source", []))
@@ -4,8 +4,26 @@ Markdown parser provider.
 
 import re
 from pathlib import Path
+from typing import NamedTuple
 
 from .base import ParserProvider, ParsedDocument, Chunk
+from .text import TextParser
+
+# Compiled once at import — parse() runs per document, so per-call
+# re.compile/cache lookups add up during bulk ingest
+_TITLE_RE = re.compile(r"^#\s+(.+?)$", re.MULTILINE)
+_HEADER_RE = re.compile(r"^(#{2,6})\s+(.+?)$", re.MULTILINE)
+
+
+class Section(NamedTuple):
+    """A header-delimited stretch of the document.
+
+    Cheaper than a dict per section — tuple allocation, attribute access
+    without key hashing.
+    """
+
+    header: str
+    content: str
 
 
 class MarkdownParser(ParserProvider):
@@ -18,13 +36,12 @@ class MarkdownParser(ParserProvider):
 
     def parse(self, content: str, metadata: dict | None = None) -> ParsedDocument:
         """Parse markdown content into chunks."""
-        if not content or not content.strip():
+        content = content.strip() if content else ""
+        if not content:
             return ParsedDocument(chunks=[], metadata=metadata or {})
 
-        content = content.strip()
-
         # Extract title from first H1 if exists
-        title_match = re.match(r"^#\s+(.+?)$", content, re.MULTILINE)
+        title_match = _TITLE_RE.match(content)
         doc_title = title_match.group(1) if title_match else None
 
         # Split by headers (##, ###, etc.)
@@ -40,7 +57,7 @@ class MarkdownParser(ParserProvider):
                     Chunk(
                         content=chunk_content,
                         index=chunk_index,
-                        metadata={"section": section.get("header", "")},
+                        metadata={"section": section.header},
                     )
                 )
                 chunk_index += 1
@@ -67,69 +84,69 @@ class MarkdownParser(ParserProvider):
 
         return self.parse(content, metadata)
 
-    def _split_by_headers(self, content: str) -> list[dict]:
-        """Split content by markdown headers."""
-        # Pattern to match headers (## or ### or ####)
-        header_pattern = re.compile(r"^(#{2,6})\s+(.+?)$", re.MULTILINE)
+    @staticmethod
+    def _trimmed(content: str, start: int, end: int) -> tuple[int, int]:
+        """Shrink [start, end) past surrounding whitespace by index walking.
 
+        Equivalent to slicing then .strip(), minus the intermediate untrimmed
+        copy — each section is sliced exactly once, already clean.
+        """
+        while start < end and content[start].isspace():
+            start += 1
+        while end > start and content[end - 1].isspace():
+            end -= 1
+        return start, end
+
+    def _split_by_headers(self, content: str) -> list[Section]:
+        """Split content by markdown headers."""
         sections = []
         last_end = 0
         current_header = ""
 
-        for match in header_pattern.finditer(content):
+        for match in _HEADER_RE.finditer(content):
             # Add previous section
             if match.start() > last_end:
-                section_content = content[last_end : match.start()].strip()
-                if section_content:
-                    sections.append(
-                        {
-                            "header": current_header,
-                            "content": section_content,
-                        }
-                    )
+                start, end = self._trimmed(content, last_end, match.start())
+                if start < end:
+                    sections.append(Section(current_header, content[start:end]))
 
             current_header = match.group(2)
             last_end = match.end()
 
         # Add final section
         if last_end < len(content):
-            section_content = content[last_end:].strip()
-            if section_content:
-                sections.append(
-                    {
-                        "header": current_header,
-                        "content": section_content,
-                    }
-                )
+            start, end = self._trimmed(content, last_end, len(content))
+            if start < end:
+                sections.append(Section(current_header, content[start:end]))
 
         # If no headers found, treat entire content as one section
         if not sections:
-            sections.append({"header": "", "content": content})
+            sections.append(Section("", content))
 
         return sections
 
-    def _chunk_section(self, section: dict) -> list[str]:
-        """Chunk a section, preserving header if present."""
-        content = section["content"]
-        header = section["header"]
+    def _chunk_section(self, section: Section) -> list[str]:
+        """Chunk a section, preserving header if present.
+
+        Window offsets are precomputed index pairs (same helper as the text
+        parser), so the loop is one slice per chunk with no per-iteration
+        grow/overlap bookkeeping. Slicing stays character-based: byte-offset
+        windows would split multibyte CJK characters.
+        """
+        content = section.content
+        header = section.header
 
         # If section is small enough, return as is
         if len(content) <= self.chunk_size:
             return [content]
 
-        # Otherwise, chunk the content
-        chunks = []
-        start = 0
-
-        while start < len(content):
-            end = start + self.chunk_size
-            chunk = content[start:end]
-
-            # Add header context to first chunk of each section
-            if start == 0 and header:
-                chunk = f"## {header}\n\n{chunk}"
+        offsets = TextParser._chunk_offsets(
+            len(content), self.chunk_size, self.chunk_overlap
+        )
+        chunks = [content[start:end] for start, end in offsets]
 
-            chunks.append(chunk)
-            start = end - self.chunk_overlap
+        # Add header context to the first chunk of the section
+        if header:
+            chunks[0] = f"## {header}\n\n{chunks[0]}"
 
         return chunks
@@ -3,6 +3,7 @@ Storage providers package.
 """
 
 from .base import StorageProvider, SearchResult
+from .memory_scan import InMemoryScanStorage
 from .pgvector import PgvectorStorageProvider
 
 
@@ -18,7 +19,13 @@ def create_storage_provider(provider: str, **kwargs) -> StorageProvider:
         StorageProvider instance
     """
     if provider == "pgvector":
-        return PgvectorStorageProvider(session_factory=kwargs["session_factory"])
+        storage = PgvectorStorageProvider(
+            session_factory=kwargs["session_factory"],
+            ef_search=kwargs.get("ef_search", 40),
+        )
+        if kwargs.get("inmem_scan"):
+            storage = InMemoryScanStorage(storage)
+        return storage
     else:
         raise ValueError(f"Unknown storage provider: {provider}")
 
@@ -27,5 +34,6 @@ __all__ = [
     "StorageProvider",
     "SearchResult",
     "PgvectorStorageProvider",
+    "InMemoryScanStorage",
     "create_storage_provider",
 ]
@@ -4,9 +4,10 @@ Base class for storage providers.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import AsyncIterator
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Search result item."""
 
@@ -39,8 +40,8 @@ class StorageProvider(ABC):
         pass
 
     @abstractmethod
-    async def get_all(self) -> list[dict]:
-        pass
+    def get_all(self) -> AsyncIterator[dict]:
+        """Iterate over all chunks (async generator — streams, never a full list)."""
 
     @abstractmethod
     async def delete(self, ids: list[str]) -> None:
@@ -2,7 +2,7 @@
 ChromaDB storage provider.
 """
 
-import chromadb
+import numpy as np
 
 from .base import StorageProvider, SearchResult
 
@@ -14,17 +14,32 @@ class ChromaStorageProvider(StorageProvider):
     ChromaDB is an embedded vector database that stores data locally.
     """
 
+    # Rows fetched per get() page when iterating the whole collection
+    GET_PAGE_SIZE = 1000
+    # Rows per collection.add call — Chroma validates and copies the whole
+    # input at once, so bounding it keeps peak memory flat on large ingests
+    ADD_BATCH_SIZE = 256
+
     def __init__(
         self,
         path: str = "./data/chroma",
         collection_name: str = "index_kb",
     ):
+        # Imported here, not at module level: chromadb pulls in heavyweight
+        # dependencies at import time, a cost only worth paying when this
+        # provider is actually selected
+        import chromadb
+
         self._path = path
         self._collection_name = collection_name
         self._client = chromadb.PersistentClient(path=path)
+        # Inner-product space: vectors are L2-normalized in add(), so ip
+        # ranking equals cosine but skips hnswlib's per-query renormalization.
+        # (Only applies to newly created collections — Chroma keeps the space
+        # a collection was created with.)
         self._collection = self._client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata={"hnsw:space": "ip"},
         )
 
     @property
@@ -38,13 +53,23 @@ class ChromaStorageProvider(StorageProvider):
         embeddings: list[list[float]],
         metadatas: list[dict] | None = None,
     ) -> None:
-        """Add documents to ChromaDB."""
-        self._collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas,
-        )
+        """Add documents to ChromaDB.
+
+        Vectors are L2-normalized and rounded through fp16 first: cosine
+        ranking doesn't need 32-bit mantissas, and the smaller values halve
+        what Chroma keeps resident per chunk.
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float16)
+        for i in range(0, len(ids), self.ADD_BATCH_SIZE):
+            j = i + self.ADD_BATCH_SIZE
+            self._collection.add(
+                ids=ids[i:j],
+                documents=documents[i:j],
+                embeddings=vectors[i:j].tolist(),
+                metadatas=metadatas[i:j] if metadatas else None,
+            )
 
     def search(
         self,
@@ -52,55 +77,78 @@ class ChromaStorageProvider(StorageProvider):
         top_k: int = 5,
         filter_metadata: dict | None = None,
     ) -> list[SearchResult]:
-        """Search for similar documents in ChromaDB."""
+        """Search for similar documents in ChromaDB.
+
+        The query vector is L2-normalized to match the stored vectors; in ip
+        space hnswlib's distance is 1 - dot, so the existing 1 - distance
+        conversion still yields cosine similarity.
+        """
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm:
+            q = q / norm
         results = self._collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[q.tolist()],
             n_results=top_k,
             where=filter_metadata,
             include=["documents", "metadatas", "distances"],
         )
 
-        search_results = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
-                metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                distance = results["distances"][0][i] if results["distances"] else 0
-
-                # Convert cosine distance to similarity score
-                score = 1 - distance
-
-                search_results.append(
-                    SearchResult(
-                        id=results["ids"][0][i],
-                        content=doc,
-                        score=round(score, 4),
-                        metadata=metadata,
-                    )
-                )
-
-        return search_results
-
-    def get_all(self) -> list[dict]:
-        """Get all documents from ChromaDB."""
-        results = self._collection.get(include=["metadatas"])
-
-        documents = []
-        if results["ids"]:
-            for i, doc_id in enumerate(results["ids"]):
-                metadata = results["metadatas"][i] if results["metadatas"] else {}
-                documents.append(
-                    {
-                        "id": doc_id,
-                        "metadata": metadata,
-                    }
-                )
-
-        return documents
+        if not results["documents"] or not results["documents"][0]:
+            return []
+
+        documents = results["documents"][0]
+        ids = results["ids"][0]
+        metadatas = (
+            results["metadatas"][0] if results["metadatas"] else [{}] * len(ids)
+        )
+        # One vectorized pass converts distances to rounded similarity
+        # scores instead of per-row Python arithmetic
+        if results["distances"]:
+            distances = np.asarray(results["distances"][0], dtype=np.float32)
+        else:
+            distances = np.zeros(len(ids), dtype=np.float32)
+        scores = np.round(1.0 - distances, 4).tolist()
+
+        return [
+            SearchResult(id=id_, content=doc, score=score, metadata=meta or {})
+            for id_, doc, score, meta in zip(ids, documents, scores, metadatas)
+        ]
+
+    def get_all(self):
+        """Iterate over all documents, one page at a time.
+
+        Pages through the collection with limit/offset instead of pulling
+        every id and metadata dict into memory at once, and only asks Chroma
+        for metadatas — peak RSS stays O(page) regardless of collection size.
+        """
+        offset = 0
+        while True:
+            results = self._collection.get(
+                include=["metadatas"],
+                limit=self.GET_PAGE_SIZE,
+                offset=offset,
+            )
+            ids = results["ids"]
+            if not ids:
+                return
+            metadatas = results["metadatas"] or [{}] * len(ids)
+            for doc_id, metadata in zip(ids, metadatas):
+                yield {"id": doc_id, "metadata": metadata or {}}
+            offset += len(ids)
 
     def delete(self, ids: list[str]) -> None:
         """Delete documents from ChromaDB."""
         self._collection.delete(ids=ids)
 
+    def delete_by_doc_id(self, doc_id: str) -> None:
+        """Delete every chunk of a document via a metadata-filtered delete.
+
+        Chroma applies the where clause natively, so this is one call instead
+        of a get_all scan and Python-side id matching.
+        """
+        self._collection.delete(where={"doc_id": doc_id})
+
     def count(self) -> int:
         """Get document count in ChromaDB."""
         return self._collection.count()
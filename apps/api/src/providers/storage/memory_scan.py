@@ -0,0 +1,201 @@
+"""
+In-memory flat-scan layer over the pgvector storage provider.
+
+For collections up to ~100k chunks a brute-force matmul over one contiguous,
+L2-normalized matrix answers a query in well under a millisecond — faster
+than an HNSW round-trip to Postgres, with exact recall and no index to
+maintain. All writes still go to the backing provider (the durable source of
+truth); the mirror loads lazily on first search and is updated incrementally.
+
+Enabled via ENABLE_INMEM_SCAN=1 (Settings.enable_inmem_scan).
+"""
+
+import asyncio
+
+import numpy as np
+from loguru import logger
+
+from .base import StorageProvider, SearchResult
+
+
+class InMemoryScanStorage(StorageProvider):
+    """Brute-force in-RAM mirror wrapping another storage provider.
+
+    Vectors are held as fp16 rows (half the RSS of fp32, ample precision for
+    cosine ranking). Deletes only tombstone rows; the matrix is compacted
+    once fewer than half the rows are live.
+    """
+
+    REBUILD_DENSITY = 0.5
+
+    def __init__(self, inner: StorageProvider):
+        self._inner = inner
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._matrix: np.ndarray | None = None  # (capacity, dim) fp16, normalized
+        self._size = 0
+        self._ids: list[str] = []
+        self._contents: list[str] = []
+        self._metas: list[dict] = []
+        self._live: np.ndarray | None = None  # (capacity,) bool
+        self._row_of: dict[str, int] = {}
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            rows: list[np.ndarray] = []
+            async for chunk in self._inner.iter_vectors():
+                self._ids.append(chunk["id"])
+                self._contents.append(chunk["content"])
+                self._metas.append(chunk["metadata"])
+                rows.append(np.asarray(chunk["embedding"], dtype=np.float32))
+            self._size = len(rows)
+            capacity = max(self._size, 1024)
+            if rows:
+                dim = len(rows[0])
+                self._matrix = np.zeros((capacity, dim), dtype=np.float16)
+                self._matrix[: self._size] = self._normalize(
+                    np.stack(rows)
+                ).astype(np.float16)
+            self._live = np.zeros(capacity, dtype=bool)
+            self._live[: self._size] = True
+            self._row_of = {id_: i for i, id_ in enumerate(self._ids)}
+            self._loaded = True
+            logger.info(f"In-memory scan mirror loaded: {self._size} vectors")
+
+    def _append(self, ids, documents, vectors: np.ndarray, metadatas) -> None:
+        """Grow the matrix with amortized doubling and append new rows."""
+        n = len(ids)
+        if self._matrix is None:
+            capacity = max(n, 1024)
+            self._matrix = np.zeros((capacity, vectors.shape[1]), dtype=np.float16)
+            self._live = np.zeros(capacity, dtype=bool)
+        elif self._size + n > self._matrix.shape[0]:
+            capacity = max(self._matrix.shape[0] * 2, self._size + n)
+            grown = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float16)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+            live = np.zeros(capacity, dtype=bool)
+            live[: self._size] = self._live[: self._size]
+            self._live = live
+        self._matrix[self._size : self._size + n] = vectors.astype(np.float16)
+        self._live[self._size : self._size + n] = True
+        for i, id_ in enumerate(ids):
+            self._row_of[id_] = self._size + i
+        self._ids.extend(ids)
+        self._contents.extend(documents)
+        self._metas.extend(m or {} for m in metadatas)
+        self._size += n
+
+    def _tombstone(self, row: int) -> None:
+        self._live[row] = False
+        self._row_of.pop(self._ids[row], None)
+
+    def _maybe_compact(self) -> None:
+        """Drop dead rows once live density falls below REBUILD_DENSITY."""
+        if self._size == 0:
+            return
+        keep = np.flatnonzero(self._live[: self._size])
+        if len(keep) / self._size >= self.REBUILD_DENSITY:
+            return
+        self._matrix[: len(keep)] = self._matrix[keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._contents = [self._contents[i] for i in keep]
+        self._metas = [self._metas[i] for i in keep]
+        self._size = len(keep)
+        self._live[:] = False
+        self._live[: self._size] = True
+        self._row_of = {id_: i for i, id_ in enumerate(self._ids)}
+
+    async def add(self, ids, documents, embeddings, metadatas=None) -> None:
+        await self._inner.add(ids, documents, embeddings, metadatas)
+        if not self._loaded:
+            return
+        async with self._lock:
+            vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+            self._append(ids, documents, vectors, metadatas or [{}] * len(ids))
+
+    async def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filter_metadata: dict | None = None,
+    ) -> list[SearchResult]:
+        # The scan has no metadata index — filtered queries go to Postgres
+        if filter_metadata:
+            return await self._inner.search(query_embedding, top_k, filter_metadata)
+
+        await self._ensure_loaded()
+        if self._size == 0:
+            return []
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        q = (q / norm if norm else q).astype(np.float16)
+        # One matvec over the normalized matrix = cosine similarity per row
+        scores = (self._matrix[: self._size] @ q).astype(np.float32)
+        scores[~self._live[: self._size]] = -np.inf
+        k = min(top_k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            SearchResult(
+                id=self._ids[i],
+                content=self._contents[i],
+                score=round(float(scores[i]), 4),
+                metadata=self._metas[i],
+            )
+            for i in top
+            if scores[i] != -np.inf
+        ]
+
+    async def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 5,
+    ) -> list[list[SearchResult]]:
+        return [await self.search(q, top_k=top_k) for q in query_embeddings]
+
+    async def get_all(self):
+        async for row in self._inner.get_all():
+            yield row
+
+    async def iter_vectors(self):
+        async for row in self._inner.iter_vectors():
+            yield row
+
+    async def delete(self, ids: list[str]) -> None:
+        await self._inner.delete(ids)
+        if not self._loaded:
+            return
+        async with self._lock:
+            for id_ in ids:
+                row = self._row_of.get(id_)
+                if row is not None:
+                    self._tombstone(row)
+            self._maybe_compact()
+
+    async def delete_by_doc_id(self, doc_id: str) -> None:
+        await self._inner.delete_by_doc_id(doc_id)
+        if not self._loaded:
+            return
+        async with self._lock:
+            for row in np.flatnonzero(self._live[: self._size]):
+                if self._metas[row].get("doc_id") == doc_id:
+                    self._tombstone(row)
+            self._maybe_compact()
+
+    async def ensure_index(self) -> None:
+        if hasattr(self._inner, "ensure_index"):
+            await self._inner.ensure_index()
+
+    async def count(self, exact: bool = False) -> int:
+        return await self._inner.count(exact=exact)
@@ -2,7 +2,10 @@
 PostgreSQL + pgvector storage provider.
 """
 
-from sqlalchemy import select, func, delete
+from typing import AsyncIterator
+
+from sqlalchemy import select, func, delete, literal, text, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from .base import StorageProvider, SearchResult
@@ -13,8 +16,43 @@ from ...models.document import Document
 class PgvectorStorageProvider(StorageProvider):
     """Storage provider using PostgreSQL + pgvector."""
 
-    def __init__(self, session_factory: async_sessionmaker):
+    def __init__(self, session_factory: async_sessionmaker, ef_search: int = 40):
         self._session_factory = session_factory
+        self._ef_search = ef_search
+
+    @staticmethod
+    def _hnsw_params(vector_count: int) -> tuple[int, int]:
+        """Pick (m, ef_construction) for the collection size.
+
+        Larger graphs need more neighbors per node to keep recall; small
+        collections get cheaper builds.
+        """
+        if vector_count < 10_000:
+            return 16, 64
+        if vector_count < 100_000:
+            return 16, 100
+        if vector_count < 1_000_000:
+            return 24, 128
+        return 32, 200
+
+    async def ensure_index(self) -> None:
+        """Create the HNSW index if missing, sized to the current collection.
+
+        Called at app startup; IF NOT EXISTS makes it a no-op for databases
+        provisioned through init.sql.
+        """
+        async with self._session_factory() as session:
+            count = await session.scalar(select(func.count()).select_from(Chunk)) or 0
+            m, ef_construction = self._hnsw_params(count)
+            await session.execute(text("SET maintenance_work_mem = '512MB'"))
+            await session.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_chunks_embedding ON chunks "
+                    "USING hnsw (embedding halfvec_cosine_ops) "
+                    f"WITH (m = {m}, ef_construction = {ef_construction})"
+                )
+            )
+            await session.commit()
 
     async def add(
         self,
@@ -23,20 +61,32 @@ class PgvectorStorageProvider(StorageProvider):
         embeddings: list[list[float]],
         metadatas: list[dict] | None = None,
     ) -> None:
-        """Add chunks to PostgreSQL."""
+        """Add chunks to PostgreSQL in one bulk insert."""
+        if not ids:
+            return
+        rows = []
+        for i, id_ in enumerate(ids):
+            meta = metadatas[i] if metadatas else {}
+            rows.append(
+                {
+                    "id": id_,
+                    "content": documents[i],
+                    "embedding": embeddings[i],
+                    "doc_id": meta.get("doc_id", ""),
+                    "source": meta.get("source"),
+                    "chunk_index": meta.get("chunk_index", 0),
+                    "metadata_": meta,
+                }
+            )
         async with self._session_factory() as session:
-            for i, id_ in enumerate(ids):
-                meta = metadatas[i] if metadatas else {}
-                chunk = Chunk(
-                    id=id_,
-                    content=documents[i],
-                    embedding=embeddings[i],
-                    doc_id=meta.get("doc_id", ""),
-                    source=meta.get("source"),
-                    chunk_index=meta.get("chunk_index", 0),
-                    metadata_=meta,
-                )
-                session.add(chunk)
+            # Core executemany: asyncpg pipelines the rows in one round-trip,
+            # skipping per-row ORM object construction and identity tracking.
+            # ON CONFLICT DO NOTHING makes a retried pipeline idempotent
+            # instead of failing the whole batch on one duplicate id.
+            await session.execute(
+                pg_insert(Chunk).on_conflict_do_nothing(index_elements=["id"]),
+                rows,
+            )
             await session.commit()
 
     async def search(
@@ -47,42 +97,157 @@ class PgvectorStorageProvider(StorageProvider):
     ) -> list[SearchResult]:
         """Search for similar chunks using cosine distance."""
         async with self._session_factory() as session:
+            # Raise the HNSW candidate list for larger top_k; SET LOCAL scopes
+            # it to this transaction only
+            ef_search = max(self._ef_search, top_k * 4)
+            await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
             distance = Chunk.embedding.cosine_distance(query_embedding)
-            query = select(Chunk, distance.label("distance"))
+            # Core column select: no Chunk ORM instances are built just to
+            # read four attributes, and the vector column never leaves
+            # Postgres — the distance is computed server-side
+            query = select(
+                Chunk.id,
+                Chunk.content,
+                Chunk.source,
+                Chunk.metadata_,
+                distance.label("distance"),
+            )
 
             if filter_metadata:
+                # doc_id is a first-class column with its own B-tree index
                 if "doc_id" in filter_metadata:
                     query = query.where(Chunk.doc_id == filter_metadata["doc_id"])
+                rest = {k: v for k, v in filter_metadata.items() if k != "doc_id"}
+                if rest:
+                    # JSONB containment (@>) — served by the jsonb_path_ops
+                    # GIN index, pruning candidates before the distance scan
+                    query = query.where(Chunk.metadata_.contains(rest))
 
             query = query.order_by(distance).limit(top_k)
             result = await session.execute(query)
 
             return [
                 SearchResult(
-                    id=row.Chunk.id,
-                    content=row.Chunk.content,
+                    id=row.id,
+                    content=row.content,
                     score=round(1 - row.distance, 4),
-                    metadata={**(row.Chunk.metadata_ or {}), "source": row.Chunk.source or ""},
+                    metadata={**(row.metadata_ or {}), "source": row.source or ""},
                 )
                 for row in result
             ]
 
-    async def get_all(self) -> list[dict]:
-        """Get all chunks."""
+    async def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 5,
+    ) -> list[list[SearchResult]]:
+        """Run several vector searches in one SQL round-trip.
+
+        Each query gets its own SELECT with ORDER BY/LIMIT (so the HNSW
+        index is used per arm); the arms are combined with UNION ALL and a
+        q_idx literal routes rows back to their query.
+        """
+        if not query_embeddings:
+            return []
         async with self._session_factory() as session:
-            result = await session.execute(select(Chunk))
-            return [
-                {
-                    "id": chunk.id,
+            ef_search = max(self._ef_search, top_k * 4)
+            await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+            selects = []
+            for i, emb in enumerate(query_embeddings):
+                distance = Chunk.embedding.cosine_distance(emb)
+                selects.append(
+                    select(
+                        literal(i).label("q_idx"),
+                        Chunk.id,
+                        Chunk.content,
+                        Chunk.source,
+                        Chunk.metadata_,
+                        distance.label("distance"),
+                    )
+                    .order_by(distance)
+                    .limit(top_k)
+                )
+            query = selects[0] if len(selects) == 1 else union_all(*selects)
+            result = await session.execute(query)
+
+            grouped: list[list[tuple[float, SearchResult]]] = [
+                [] for _ in query_embeddings
+            ]
+            for row in result:
+                grouped[row.q_idx].append(
+                    (
+                        row.distance,
+                        SearchResult(
+                            id=row.id,
+                            content=row.content,
+                            score=round(1 - row.distance, 4),
+                            metadata={**(row.metadata_ or {}), "source": row.source or ""},
+                        ),
+                    )
+                )
+            # UNION ALL does not guarantee per-arm row order
+            return [[r for _, r in sorted(g, key=lambda t: t[0])] for g in grouped]
+
+    async def get_all(self) -> AsyncIterator[dict]:
+        """Stream all chunks one batch at a time.
+
+        yield_per drives a server-side cursor, so memory stays O(batch)
+        instead of materializing every row at once. Only metadata columns are
+        selected — the embedding never leaves Postgres for this listing.
+        """
+        async with self._session_factory() as session:
+            result = await session.stream(
+                select(
+                    Chunk.id,
+                    Chunk.doc_id,
+                    Chunk.source,
+                    Chunk.chunk_index,
+                    Chunk.metadata_,
+                ).execution_options(yield_per=1000)
+            )
+            async for row in result:
+                yield {
+                    "id": row.id,
                     "metadata": {
-                        **(chunk.metadata_ or {}),
-                        "doc_id": chunk.doc_id,
-                        "source": chunk.source or "",
-                        "chunk_index": chunk.chunk_index or 0,
+                        **(row.metadata_ or {}),
+                        "doc_id": row.doc_id,
+                        "source": row.source or "",
+                        "chunk_index": row.chunk_index or 0,
+                    },
+                }
+
+    async def iter_vectors(self) -> AsyncIterator[dict]:
+        """Stream every chunk including its embedding.
+
+        Used by InMemoryScanStorage to build its flat-scan mirror; the same
+        server-side cursor as get_all keeps memory O(batch) during the load.
+        """
+        async with self._session_factory() as session:
+            result = await session.stream(
+                select(
+                    Chunk.id,
+                    Chunk.content,
+                    Chunk.doc_id,
+                    Chunk.source,
+                    Chunk.chunk_index,
+                    Chunk.metadata_,
+                    Chunk.embedding,
+                ).execution_options(yield_per=1000)
+            )
+            async for row in result:
+                yield {
+                    "id": row.id,
+                    "content": row.content,
+                    "embedding": row.embedding,
+                    "metadata": {
+                        **(row.metadata_ or {}),
+                        "doc_id": row.doc_id,
+                        "source": row.source or "",
+                        "chunk_index": row.chunk_index or 0,
                     },
                 }
-                for chunk in result.scalars()
-            ]
 
     async def delete(self, ids: list[str]) -> None:
         """Delete chunks by IDs."""
@@ -97,8 +262,20 @@ class PgvectorStorageProvider(StorageProvider):
             await session.execute(delete(Document).where(Document.id == doc_id))
             await session.commit()
 
-    async def count(self) -> int:
-        """Get total chunk count."""
+    async def count(self, exact: bool = False) -> int:
+        """Get total chunk count.
+
+        The default reads the planner's reltuples estimate — an O(1) catalog
+        lookup instead of a full table scan, plenty for the stats endpoint.
+        Pass exact=True for the precise number; a table that has never been
+        analyzed (reltuples = -1) also falls back to the real count.
+        """
         async with self._session_factory() as session:
+            if not exact:
+                estimate = await session.scalar(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'chunks'")
+                )
+                if estimate is not None and estimate >= 0:
+                    return int(estimate)
             result = await session.scalar(select(func.count(Chunk.id)))
             return result or 0
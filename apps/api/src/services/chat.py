@@ -2,22 +2,41 @@
 Chat service - Claude conversation with streaming + Tool-based RAG.
 """
 
-import json
+import asyncio
+import time
 import uuid
 from typing import AsyncGenerator
 
 import anthropic
+import orjson
 from loguru import logger
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
 
+from ..database import session_scope
 from ..models.conversation import Conversation, Message
 from .search import SearchService
 
 
+def _sse(payload: dict) -> bytes:
+    """Encode one SSE frame as bytes — uvicorn writes them through as-is."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
 class ChatService:
     """Claude chat with streaming SSE and optional RAG tool."""
 
+    MODEL = "claude-sonnet-4-20250514"
+    SYSTEM_PROMPT = "你是一个友好的学习助手。如果用户的问题可能与知识库内容相关，请使用 search_knowledge 工具搜索。回答时请使用中文。"
+
+    # Most recent messages sent to Claude per turn (token + DB bound)
+    HISTORY_WINDOW = 20
+
+    # Tool-result cache: consecutive tool-use turns often repeat the query
+    QUERY_CACHE_TTL = 300.0
+    QUERY_CACHE_MAX = 256
+
     def __init__(
         self,
         api_key: str,
@@ -27,36 +46,63 @@ class ChatService:
         self._client = anthropic.AsyncAnthropic(api_key=api_key)
         self._search = search_service
         self._session_factory = session_factory
+        self._query_cache: dict[str, tuple[float, list]] = {}
+        # Conversations already titled (skip the per-turn lookup) and
+        # in-flight background tasks (kept referenced until done)
+        self._titled: set[str] = set()
+        self._bg_tasks: set[asyncio.Task] = set()
+
+    async def _search_cached(self, query: str, top_k: int = 5) -> list:
+        """Run a knowledge search, reusing recent results for repeat queries.
+
+        Saves the embed call plus vector scan when Claude re-asks the same
+        thing across tool-use iterations. Entries expire after a few minutes
+        so fresh documents still show up.
+        """
+        key = " ".join(query.split()).lower()
+        now = time.monotonic()
+        hit = self._query_cache.get(key)
+        if hit is not None and now - hit[0] < self.QUERY_CACHE_TTL:
+            return hit[1]
+        results = await self._search.search(query, top_k=top_k)
+        if len(self._query_cache) >= self.QUERY_CACHE_MAX:
+            # Drop the oldest insertion (dicts preserve insertion order)
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[key] = (now, results)
+        return results
 
     async def stream_chat(
         self,
         conversation_id: str,
         message: str,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Stream Claude response as SSE events."""
 
-        # Save user message
+        # Save the user message and load recent history in one transaction —
+        # one connection acquire and one commit before Claude is called,
+        # instead of two. The uncommitted insert is visible to the SELECT,
+        # so the new message is part of the window. The window itself is
+        # limited server-side; the old query scanned the whole conversation.
         user_msg_id = str(uuid.uuid4())
         async with self._session_factory() as session:
-            session.add(Message(
-                id=user_msg_id,
-                conversation_id=conversation_id,
-                role="user",
-                content=message,
-            ))
-            await session.commit()
-
-        # Load conversation history
-        async with self._session_factory() as session:
+            await session.execute(
+                insert(Message).values(
+                    id=user_msg_id,
+                    conversation_id=conversation_id,
+                    role="user",
+                    content=message,
+                )
+            )
             result = await session.execute(
                 select(Message)
                 .where(Message.conversation_id == conversation_id)
-                .order_by(Message.created_at)
+                .order_by(Message.created_at.desc())
+                .limit(self.HISTORY_WINDOW)
             )
-            history = result.scalars().all()
+            history = list(reversed(result.scalars().all()))
+            await session.commit()
 
-        # Build messages for Claude (keep last 20 to avoid token limit blowup)
-        messages = [{"role": m.role, "content": m.content} for m in history[-20:]]
+        messages = [{"role": m.role, "content": m.content} for m in history]
 
         # Define RAG search tool
         tools = [
@@ -81,21 +127,28 @@ class ChatService:
             input_tokens = 0
             output_tokens = 0
 
-            # First call - Claude may decide to use tools
-            response = await self._client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system="你是一个友好的学习助手。如果用户的问题可能与知识库内容相关，请使用 search_knowledge 工具搜索。回答时请使用中文。",
-                messages=messages,
-                tools=tools,
-            )
+            # Each turn streams tokens to the browser as they arrive instead
+            # of waiting for the full completion; tool use (capped at 5
+            # iterations) re-enters the loop with the tool result appended
+            tool_iteration = 0
+            while True:
+                async with self._client.messages.stream(
+                    model=self.MODEL,
+                    max_tokens=4096,
+                    system=self.SYSTEM_PROMPT,
+                    messages=messages,
+                    tools=tools,
+                ) as stream:
+                    async for text in stream.text_stream:
+                        full_response += text
+                        yield _sse({"type": "text", "text": text})
+                    response = await stream.get_final_message()
 
-            input_tokens += response.usage.input_tokens
-            output_tokens += response.usage.output_tokens
+                input_tokens += response.usage.input_tokens
+                output_tokens += response.usage.output_tokens
 
-            # Handle tool use (cap at 5 iterations to prevent infinite loops)
-            tool_iteration = 0
-            while response.stop_reason == "tool_use" and tool_iteration < 5:
+                if response.stop_reason != "tool_use" or tool_iteration >= 5:
+                    break
                 tool_iteration += 1
                 tool_use_block = next(
                     b for b in response.content if b.type == "tool_use"
@@ -103,14 +156,14 @@ class ChatService:
 
                 # Execute search
                 search_query = tool_use_block.input.get("query", "")
-                search_results = await self._search.search(search_query, top_k=5)
+                search_results = await self._search_cached(search_query, top_k=5)
 
                 # Send source citations to frontend
                 sources = [
                     {"content": r.content[:200], "source": r.source, "score": r.score}
                     for r in search_results
                 ]
-                yield f"data: {json.dumps({'type': 'source', 'sources': sources}, ensure_ascii=False)}\n\n"
+                yield _sse({"type": "source", "sources": sources})
 
                 # Build tool result
                 tool_result_content = "\n\n---\n\n".join(
@@ -130,47 +183,42 @@ class ChatService:
                     ],
                 })
 
-                response = await self._client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=4096,
-                    system="你是一个友好的学习助手。如果用户的问题可能与知识库内容相关，请使用 search_knowledge 工具搜索。回答时请使用中文。",
-                    messages=messages,
-                    tools=tools,
-                )
-
-                input_tokens += response.usage.input_tokens
-                output_tokens += response.usage.output_tokens
-
-            # Extract text from final response
-            for block in response.content:
-                if hasattr(block, "text"):
-                    full_response += block.text
-                    yield f"data: {json.dumps({'type': 'text', 'text': block.text}, ensure_ascii=False)}\n\n"
-
-            # Save assistant message
+            # Save assistant message (Core insert — skips unit-of-work overhead)
             assistant_msg_id = str(uuid.uuid4())
             async with self._session_factory() as session:
-                session.add(Message(
-                    id=assistant_msg_id,
-                    conversation_id=conversation_id,
-                    role="assistant",
-                    content=full_response,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                ))
+                await session.execute(
+                    insert(Message).values(
+                        id=assistant_msg_id,
+                        conversation_id=conversation_id,
+                        role="assistant",
+                        content=full_response,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                    )
+                )
                 await session.commit()
 
-            # Auto-generate title for first message
-            await self._maybe_generate_title(conversation_id, message)
+            # Auto-generate title in the background — the done event should
+            # not wait on another DB round-trip
+            if conversation_id not in self._titled:
+                task = asyncio.create_task(
+                    self._maybe_generate_title(conversation_id, message)
+                )
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
 
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            yield _sse({"type": "done"})
 
         except Exception as e:
             logger.error(f"Chat error: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse({"type": "error", "message": str(e)})
 
     async def _maybe_generate_title(self, conversation_id: str, first_message: str):
-        """Auto-generate conversation title from the first user message."""
+        """Auto-generate conversation title from the first user message.
+
+        Conversations known to be titled are remembered in-process so later
+        turns skip the lookup entirely.
+        """
         async with self._session_factory() as session:
             conv = await session.get(Conversation, conversation_id)
             if conv and not conv.title:
@@ -179,6 +227,8 @@ class ChatService:
                 if len(first_message) > 50:
                     conv.title += "..."
                 await session.commit()
+            if conv is not None:
+                self._titled.add(conversation_id)
 
     # --- Conversation CRUD ---
 
@@ -186,40 +236,69 @@ class ChatService:
         """Create a new conversation."""
         conv_id = str(uuid.uuid4())
         async with self._session_factory() as session:
-            conv = Conversation(id=conv_id)
-            session.add(conv)
+            # RETURNING brings back the server-side timestamps with the
+            # INSERT itself, so no refresh SELECT is needed after commit
+            result = await session.execute(
+                insert(Conversation).values(id=conv_id).returning(Conversation)
+            )
+            conv = result.scalar_one()
             await session.commit()
-            await session.refresh(conv)
             return conv
 
-    async def list_conversations(self, page: int = 1, size: int = 20) -> dict:
-        """List conversations with pagination."""
-        from sqlalchemy import func
+    async def list_conversations(
+        self, page: int = 1, size: int = 20, session: AsyncSession | None = None
+    ) -> dict:
+        """List conversations with pagination.
+
+        COUNT(*) OVER () / MAX(...) OVER () ride along with the page query,
+        so one round-trip returns rows plus totals. Window functions are
+        evaluated before LIMIT, hence they cover the whole table.
+        """
         offset = (page - 1) * size
-        async with self._session_factory() as session:
+        async with session_scope(self._session_factory, session) as session:
             result = await session.execute(
-                select(Conversation)
+                select(
+                    Conversation,
+                    func.count().over().label("total"),
+                    func.max(Conversation.updated_at).over().label("max_updated_at"),
+                )
                 .order_by(Conversation.updated_at.desc())
                 .offset(offset)
                 .limit(size)
             )
-            items = list(result.scalars().all())
-            total = await session.scalar(select(func.count(Conversation.id)))
-            return {"items": items, "total": total, "page": page, "size": size}
+            rows = result.all()
+            items = [row.Conversation for row in rows]
+            if rows:
+                total, max_updated_at = rows[0].total, rows[0].max_updated_at
+            else:
+                # Page past the end — fall back to a plain aggregate
+                stats = await session.execute(
+                    select(func.count(Conversation.id), func.max(Conversation.updated_at))
+                )
+                total, max_updated_at = stats.one()
+            return {
+                "items": items,
+                "total": total,
+                "page": page,
+                "size": size,
+                "max_updated_at": max_updated_at,
+            }
 
-    async def get_conversation(self, conv_id: str) -> dict | None:
-        """Get conversation with its messages."""
-        async with self._session_factory() as session:
-            conv = await session.get(Conversation, conv_id)
-            if not conv:
-                return None
+    async def get_conversation(
+        self, conv_id: str, session: AsyncSession | None = None
+    ) -> dict | None:
+        """Get conversation with its messages (single eager-loaded query)."""
+        async with session_scope(self._session_factory, session) as session:
             result = await session.execute(
-                select(Message)
-                .where(Message.conversation_id == conv_id)
-                .order_by(Message.created_at)
+                select(Conversation)
+                .options(selectinload(Conversation.messages))
+                .where(Conversation.id == conv_id)
             )
-            messages = list(result.scalars().all())
-            return {"conversation": conv, "messages": messages}
+            conv = result.scalar_one_or_none()
+            if not conv:
+                return None
+            # messages are ordered by created_at via the relationship
+            return {"conversation": conv, "messages": conv.messages}
 
     async def delete_conversation(self, conv_id: str) -> bool:
         """Delete a conversation and its messages (cascade)."""
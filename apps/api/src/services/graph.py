@@ -7,6 +7,7 @@ Handles concept extraction from document chunks and graph CRUD operations.
 from dataclasses import dataclass
 
 import anthropic
+import orjson
 from loguru import logger
 from neo4j import AsyncGraphDatabase, AsyncDriver
 
@@ -81,17 +82,16 @@ class GraphService:
 {text}"""}],
         )
 
-        import json
         try:
             content = response.content[0].text
             # Handle possible markdown code block wrapping
             if content.startswith("```"):
                 content = content.split("\n", 1)[1].rsplit("```", 1)[0]
-            data = json.loads(content)
+            data = orjson.loads(content)
             concepts = [Concept(**c) for c in data.get("concepts", [])]
             relations = [Relation(**r) for r in data.get("relations", [])]
             return ExtractionResult(concepts=concepts, relations=relations)
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
             logger.warning(f"Failed to parse concept extraction: {e}")
             return ExtractionResult(concepts=[], relations=[])
 
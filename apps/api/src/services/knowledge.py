@@ -6,20 +6,65 @@ Graph extraction runs as a background task to avoid blocking the upload endpoint
 """
 
 import asyncio
+import os
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
 from loguru import logger
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from ..database import session_scope
 from ..models.document import Document
 from ..providers.embedding import EmbeddingProvider
+from ..providers.embedding.cache import bump_epoch
+from ..providers.embedding.persistent import ChunkEmbedCache
 from ..providers.storage import StorageProvider
 from ..providers.parser import create_parser
 from .graph import GraphService
 
 
-@dataclass
+def _parse_in_subprocess(
+    file_type: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    content: str,
+    metadata: dict | None,
+):
+    """Top-level parse job so ProcessPoolExecutor can pickle it."""
+    parser = create_parser(
+        file_type=file_type, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    return parser.parse(content, metadata)
+
+
+_parse_pool: ProcessPoolExecutor | None = None
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+
+def _time_ordered_id() -> str:
+    """UUIDv7-style document id: 48-bit ms timestamp + 74 random bits.
+
+    Random uuid4 keys scatter inserts across the documents/chunks B-trees;
+    a timestamp prefix keeps bulk ingest appending to the same hot pages.
+    Same 36-char format as before, so nothing downstream changes.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    raw = bytearray(ts_ms.to_bytes(6, "big") + os.urandom(10))
+    raw[6] = (raw[6] & 0x0F) | 0x70  # version 7
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return str(uuid.UUID(bytes=bytes(raw)))
+
+
+@dataclass(slots=True)
 class IndexResult:
     success: bool
     doc_id: str
@@ -30,6 +75,16 @@ class IndexResult:
 class KnowledgeService:
     """Service for managing knowledge base documents."""
 
+    # Mini-batch size for the overlapped embed/store pipeline, and how many
+    # embedded batches may wait for storage before the embedder backpressures
+    INDEX_BATCH_SIZE = 64
+    QUEUE_DEPTH = 4
+    # Content larger than this parses in a subprocess (GIL-free) instead of
+    # on the event loop
+    PARSE_OFFLOAD_BYTES = 256_000
+    # How long the stats chunk count may be served from memory between writes
+    STATS_TTL = 30.0
+
     def __init__(
         self,
         embedding_provider: EmbeddingProvider,
@@ -38,6 +93,7 @@ class KnowledgeService:
         default_chunk_size: int = 500,
         default_chunk_overlap: int = 50,
         graph_service: GraphService | None = None,
+        embed_cache: ChunkEmbedCache | None = None,
     ):
         self._embedding = embedding_provider
         self._storage = storage_provider
@@ -45,96 +101,166 @@ class KnowledgeService:
         self._chunk_size = default_chunk_size
         self._chunk_overlap = default_chunk_overlap
         self._graph = graph_service
+        self._embed_cache = embed_cache
         self._bg_tasks: set[asyncio.Task] = set()
+        # (expires_at, count) — invalidated by index/delete
+        self._count_cache: tuple[float, int] | None = None
 
-    async def index_document(
+    async def create_document(
         self,
-        content: str,
         source: str = "unknown",
-        metadata: dict | None = None,
         file_type: str = "text",
-    ) -> IndexResult:
-        """Index a document: parse → embed → store in pgvector.
-
-        Graph extraction runs in the background and does not block the response.
-        """
-        doc_id = str(uuid.uuid4())
-
-        # Create document record
+        content_size: int = 0,
+    ) -> str:
+        """Create the document record up front so the API can respond early."""
+        doc_id = _time_ordered_id()
         async with self._session_factory() as session:
             doc = Document(
                 id=doc_id,
                 filename=source,
                 source=source,
                 content_type=file_type,
-                status="parsing",
-                file_size=len(content.encode()),
+                status="uploading",
+                file_size=content_size,
             )
             session.add(doc)
             await session.commit()
+        return doc_id
+
+    async def index_document(
+        self,
+        content: str,
+        source: str = "unknown",
+        metadata: dict | None = None,
+        file_type: str = "text",
+    ) -> IndexResult:
+        """Index a document synchronously: parse → embed → store in pgvector.
+
+        Graph extraction runs in the background and does not block the response.
+        """
+        doc_id = await self.create_document(
+            source=source, file_type=file_type, content_size=len(content.encode())
+        )
+        return await self.run_index_pipeline(doc_id, content, source, metadata, file_type)
+
+    async def index_documents(
+        self,
+        documents: list[dict],
+        concurrency: int = 4,
+    ) -> list[IndexResult]:
+        """Index several documents concurrently for bulk ingestion.
+
+        Each entry is a dict of index_document keyword arguments. A semaphore
+        caps how many pipelines run at once so the embedding backend sees
+        steady load instead of one burst; one document failing does not sink
+        the rest — its slot carries a failed IndexResult instead.
+        """
+        sem = asyncio.Semaphore(concurrency)
 
+        async def index_one(kwargs: dict) -> IndexResult:
+            async with sem:
+                try:
+                    return await self.index_document(**kwargs)
+                except Exception as e:
+                    return IndexResult(False, "", 0, str(e))
+
+        return list(await asyncio.gather(*(index_one(d) for d in documents)))
+
+    async def index_document_background(
+        self,
+        doc_id: str,
+        content: str,
+        source: str = "unknown",
+        metadata: dict | None = None,
+        file_type: str = "text",
+    ) -> None:
+        """Background entry point for /index — failures land in doc.status."""
         try:
-            # Parse
-            parser = create_parser(
-                file_type=file_type,
-                chunk_size=self._chunk_size,
-                chunk_overlap=self._chunk_overlap,
-            )
-            parsed = parser.parse(content, metadata)
+            await self.run_index_pipeline(doc_id, content, source, metadata, file_type)
+        except Exception:
+            # run_index_pipeline already logged and set status="error"
+            pass
+
+    async def run_index_pipeline(
+        self,
+        doc_id: str,
+        content: str,
+        source: str = "unknown",
+        metadata: dict | None = None,
+        file_type: str = "text",
+    ) -> IndexResult:
+        """Parse → embed → store for an existing document record.
+
+        Intermediate statuses (parsing/indexing) are not persisted: each one
+        cost a SELECT + UPDATE round-trip and the pipeline usually finishes
+        before anyone polls. Only the terminal status is written, as a single
+        UPDATE without loading the row first.
+        """
+        try:
+            # Parse — multi-MB documents go to a worker process so chunking
+            # doesn't stall the event loop; below the threshold the pickling
+            # round-trip would cost more than it saves
+            if len(content) > self.PARSE_OFFLOAD_BYTES:
+                parsed = await asyncio.get_running_loop().run_in_executor(
+                    _get_parse_pool(),
+                    _parse_in_subprocess,
+                    file_type,
+                    self._chunk_size,
+                    self._chunk_overlap,
+                    content,
+                    metadata,
+                )
+            else:
+                parser = create_parser(
+                    file_type=file_type,
+                    chunk_size=self._chunk_size,
+                    chunk_overlap=self._chunk_overlap,
+                )
+                parsed = parser.parse(content, metadata)
 
             if not parsed.chunks:
                 async with self._session_factory() as session:
-                    doc = await session.get(Document, doc_id)
-                    doc.status = "error"
-                    doc.error_message = "No content to index"
+                    await session.execute(
+                        update(Document)
+                        .where(Document.id == doc_id)
+                        .values(status="error", error_message="No content to index")
+                    )
                     await session.commit()
                 return IndexResult(False, doc_id, 0, "No content to index")
 
-            # Update status to indexing
-            async with self._session_factory() as session:
-                doc = await session.get(Document, doc_id)
-                doc.status = "indexing"
-                await session.commit()
-
-            # Embed
-            chunk_contents = [chunk.content for chunk in parsed.chunks]
-            embeddings = await self._embedding.embed_batch(chunk_contents)
-
-            # Store chunks
-            ids = [f"{doc_id}_{chunk.index}" for chunk in parsed.chunks]
-            metadatas = [
-                {
-                    "doc_id": doc_id,
-                    "source": source,
-                    "chunk_index": chunk.index,
-                    **(metadata or {}),
-                    **chunk.metadata,
-                }
-                for chunk in parsed.chunks
-            ]
-
-            await self._storage.add(
-                ids=ids,
-                documents=chunk_contents,
-                embeddings=embeddings,
-                metadatas=metadatas,
-            )
+            # Embed + store in overlapping mini-batches
+            await self._index_batches(doc_id, parsed.chunks, source, metadata)
 
             # Mark as ready (search is available now)
             async with self._session_factory() as session:
-                doc = await session.get(Document, doc_id)
-                doc.status = "ready"
-                doc.chunk_count = len(parsed.chunks)
+                await session.execute(
+                    update(Document)
+                    .where(Document.id == doc_id)
+                    .values(status="ready", chunk_count=len(parsed.chunks))
+                )
                 await session.commit()
 
-            # Fire-and-forget: extract concepts to knowledge graph in background
+            # Fire-and-forget: extract concepts to knowledge graph in background.
+            # Only this path needs the full-document content/id lists, so they
+            # are preallocated and filled in a single pass here rather than
+            # built unconditionally above
             if self._graph:
+                n = len(parsed.chunks)
+                chunk_contents: list = [None] * n
+                ids: list = [None] * n
+                for i, chunk in enumerate(parsed.chunks):
+                    chunk_contents[i] = chunk.content
+                    ids[i] = f"{doc_id}_{chunk.index}"
                 task = asyncio.create_task(
                     self._extract_graph_background(chunk_contents, doc_id, ids)
                 )
                 self._bg_tasks.add(task)
                 task.add_done_callback(self._bg_tasks.discard)
 
+            # New content makes cached search results and counts stale
+            bump_epoch()
+            self._count_cache = None
+
             logger.info(f"Indexed document {doc_id}: {len(parsed.chunks)} chunks from {source}")
 
             return IndexResult(
@@ -146,14 +272,124 @@ class KnowledgeService:
 
         except Exception as e:
             async with self._session_factory() as session:
-                doc = await session.get(Document, doc_id)
-                if doc:
-                    doc.status = "error"
-                    doc.error_message = str(e)
-                    await session.commit()
+                await session.execute(
+                    update(Document)
+                    .where(Document.id == doc_id)
+                    .values(status="error", error_message=str(e))
+                )
+                await session.commit()
             logger.error(f"Failed to index document {doc_id}: {e}")
             raise
 
+    async def _embed_chunks(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, collapsing byte-identical duplicates first.
+
+        Repetitive input (boilerplate, footers, tables of contents) often
+        repeats whole chunks; each distinct text is embedded once and the
+        vector fanned out to every position that carried it.
+        """
+        unique: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            unique.setdefault(text, []).append(i)
+        if len(unique) == len(texts):
+            return await self._embed_unique(texts)
+
+        uniq_embeddings = await self._embed_unique(list(unique))
+        results: list = [None] * len(texts)
+        for emb, positions in zip(uniq_embeddings, unique.values()):
+            for i in positions:
+                results[i] = emb
+        return results
+
+    async def _embed_unique(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, skipping any already in the persistent cache.
+
+        Re-ingesting a mostly unchanged document only pays for the chunks
+        that actually changed; SQLite calls run off the event loop.
+        """
+        if self._embed_cache is None:
+            return await self._embedding.embed_batch(texts)
+
+        results = await asyncio.to_thread(self._embed_cache.get_many, texts)
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            fresh = await self._embedding.embed_batch(missing_texts)
+            for i, emb in zip(missing, fresh):
+                results[i] = emb
+            await asyncio.to_thread(self._embed_cache.put_many, missing_texts, fresh)
+        return results  # type: ignore[return-value]
+
+    async def _index_batches(
+        self,
+        doc_id: str,
+        chunks: list,
+        source: str,
+        metadata: dict | None,
+    ) -> None:
+        """Embed and store chunks as a bounded producer/consumer pipeline.
+
+        The embed worker pushes (batch, vectors) pairs into a small queue and
+        the store loop drains it, so embedding can run up to QUEUE_DEPTH
+        batches ahead of pgvector inserts — DB latency hides behind the
+        embedding backend while embedded-but-unstored memory stays bounded.
+        """
+        batches = (
+            chunks[i : i + self.INDEX_BATCH_SIZE]
+            for i in range(0, len(chunks), self.INDEX_BATCH_SIZE)
+        )
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_DEPTH)
+        # Document-level keys are identical for every chunk — merge them once
+        # and copy per chunk instead of rebuilding the dict from scratch
+        base_meta = {"doc_id": doc_id, "source": source, **(metadata or {})}
+
+        def chunk_meta(c) -> dict:
+            m = base_meta.copy()
+            m["chunk_index"] = c.index
+            if c.metadata:
+                m.update(c.metadata)
+            return m
+
+        async def embed_worker() -> None:
+            try:
+                for batch in batches:
+                    embeddings = await self._embed_chunks([c.content for c in batch])
+                    await queue.put((batch, embeddings))
+            except asyncio.CancelledError:
+                # Cancelled by the store loop's failure path — the consumer
+                # is gone, so a blocking sentinel put against a full queue
+                # would leave this task pending forever. No sentinel needed:
+                # nobody is reading the queue anymore.
+                raise
+            except Exception:
+                # Embedding failed while the store loop is still draining,
+                # so this put cannot block indefinitely
+                await queue.put(None)
+                raise
+            else:
+                await queue.put(None)
+
+        embed_task = asyncio.create_task(embed_worker())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                batch, embeddings = item
+                await self._storage.add(
+                    ids=[f"{doc_id}_{c.index}" for c in batch],
+                    documents=[c.content for c in batch],
+                    embeddings=embeddings,
+                    metadatas=[chunk_meta(c) for c in batch],
+                )
+        except Exception:
+            # A storage failure must not leave the embed worker blocked on
+            # a full queue
+            embed_task.cancel()
+            raise
+        # Surface any embedding error (the sentinel arrives regardless)
+        await embed_task
+
     async def _extract_graph_background(
         self, chunks: list[str], doc_id: str, chunk_ids: list[str]
     ):
@@ -164,18 +400,41 @@ class KnowledgeService:
         except Exception as e:
             logger.warning(f"Graph extraction failed for {doc_id}: {e}")
 
-    async def list_documents(self) -> list[Document]:
-        """List all documents from the documents table."""
+    async def list_documents(self, session=None) -> list:
+        """List document rows for the /documents endpoint.
+
+        Selects only the columns the response needs, so SQLAlchemy returns
+        lightweight Row tuples instead of building ORM instances (and the
+        identity-map bookkeeping that comes with them) per document.
+        """
         from sqlalchemy import select
-        async with self._session_factory() as session:
+        async with session_scope(self._session_factory, session) as session:
             result = await session.execute(
-                select(Document).order_by(Document.created_at.desc())
+                select(
+                    Document.id,
+                    Document.filename,
+                    Document.source,
+                    Document.status,
+                    Document.chunk_count,
+                    Document.created_at,
+                    Document.updated_at,
+                ).order_by(Document.created_at.desc())
             )
-            return list(result.scalars().all())
+            return result.all()
 
     async def delete_document(self, doc_id: str) -> bool:
-        """Delete a document, its chunks, and the stored file."""
-        import os
+        """Delete a document, its chunks, and the stored file.
+
+        A full chunk id ("{doc_id}_{index}" — document ids themselves never
+        contain underscores) short-circuits to a single-row delete: no file
+        removal or graph cleanup applies to one chunk.
+        """
+        if "_" in doc_id and doc_id.rsplit("_", 1)[1].isdigit():
+            await self._storage.delete([doc_id])
+            bump_epoch()
+            self._count_cache = None
+            logger.info(f"Deleted chunk {doc_id}")
+            return True
         # Remove stored file from disk
         file_path = await self.get_file_path(doc_id)
         if file_path and os.path.exists(file_path):
@@ -187,6 +446,8 @@ class KnowledgeService:
                 await self._graph.delete_document_concepts(doc_id)
             except Exception as e:
                 logger.warning(f"Failed to clean graph for {doc_id}: {e}")
+        bump_epoch()
+        self._count_cache = None
         logger.info(f"Deleted document {doc_id}")
         return True
 
@@ -205,8 +466,17 @@ class KnowledgeService:
             return doc.file_path if doc else None
 
     async def get_stats(self) -> dict:
-        """Get knowledge base statistics."""
-        total_chunks = await self._storage.count()
+        """Get knowledge base statistics.
+
+        The chunk count is memoized for STATS_TTL seconds and dropped on any
+        index/delete, so dashboard polling stops hitting the database.
+        """
+        now = time.monotonic()
+        if self._count_cache is not None and self._count_cache[0] > now:
+            total_chunks = self._count_cache[1]
+        else:
+            total_chunks = await self._storage.count()
+            self._count_cache = (now + self.STATS_TTL, total_chunks)
         return {
             "total_chunks": total_chunks,
             "embedding_model": self._embedding.model_name,
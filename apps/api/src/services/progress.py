@@ -5,9 +5,10 @@ Learning progress service - CRUD for reading items with percentage progress.
 import uuid
 
 from loguru import logger
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import select, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from ..database import session_scope
 from ..models.learning_item import LearningItem
 
 
@@ -27,55 +28,108 @@ class ProgressService:
         """Create a learning item."""
         item_id = str(uuid.uuid4())
         async with self._session_factory() as session:
-            item = LearningItem(
-                id=item_id,
-                title=title,
-                author=author,
-                type=type,
-                document_id=document_id,
+            # RETURNING replaces the post-commit refresh SELECT
+            result = await session.execute(
+                insert(LearningItem)
+                .values(
+                    id=item_id,
+                    title=title,
+                    author=author,
+                    type=type,
+                    document_id=document_id,
+                )
+                .returning(LearningItem)
             )
-            session.add(item)
+            item = result.scalar_one()
             await session.commit()
-            await session.refresh(item)
             logger.info(f"Created learning item: {title}")
             return item
 
-    async def list_items(self, page: int = 1, size: int = 20) -> dict:
-        """List learning items with pagination."""
+    async def list_items(
+        self, page: int = 1, size: int = 20, session: AsyncSession | None = None
+    ) -> dict:
+        """List learning items with pagination.
+
+        Totals ride along as window functions (COUNT(*) OVER () etc.), so the
+        page and its aggregates come back in a single round-trip.
+        """
         offset = (page - 1) * size
-        async with self._session_factory() as session:
+        async with session_scope(self._session_factory, session) as session:
             result = await session.execute(
-                select(LearningItem)
+                select(
+                    LearningItem,
+                    func.count().over().label("total"),
+                    func.count()
+                    .filter(LearningItem.status == "completed")
+                    .over()
+                    .label("completed"),
+                    func.max(LearningItem.updated_at).over().label("max_updated_at"),
+                )
                 .order_by(LearningItem.updated_at.desc())
                 .offset(offset)
                 .limit(size)
             )
-            items = list(result.scalars().all())
-            total = await session.scalar(select(func.count(LearningItem.id)))
-            return {"items": items, "total": total, "page": page, "size": size}
+            rows = result.all()
+            items = [row.LearningItem for row in rows]
+            if rows:
+                total = rows[0].total
+                completed = rows[0].completed
+                max_updated_at = rows[0].max_updated_at
+            else:
+                # Page past the end — fall back to a plain aggregate
+                stats = await session.execute(
+                    select(
+                        func.count(LearningItem.id),
+                        func.count(LearningItem.id).filter(
+                            LearningItem.status == "completed"
+                        ),
+                        func.max(LearningItem.updated_at),
+                    )
+                )
+                total, completed, max_updated_at = stats.one()
+            return {
+                "items": items,
+                "total": total,
+                "completed": completed,
+                "page": page,
+                "size": size,
+                "max_updated_at": max_updated_at,
+            }
 
-    async def get_item(self, item_id: str) -> LearningItem | None:
+    async def get_item(
+        self, item_id: str, session: AsyncSession | None = None
+    ) -> LearningItem | None:
         """Get a learning item."""
-        async with self._session_factory() as session:
+        async with session_scope(self._session_factory, session) as session:
             return await session.get(LearningItem, item_id)
 
     async def update_item(self, item_id: str, **kwargs) -> LearningItem | None:
-        """Update a learning item's fields."""
+        """Update a learning item's fields.
+
+        One UPDATE ... RETURNING instead of load + mutate + commit + refresh:
+        the old path cost three round-trips and could race with a concurrent
+        progress update between the SELECT and the write.
+        """
+        columns = LearningItem.__table__.columns
+        values = {k: v for k, v in kwargs.items() if k in columns and v is not None}
+        # Auto-update status based on progress
+        if "progress" in values:
+            if values["progress"] >= 100:
+                values["progress"] = 100
+                values["status"] = "completed"
+            elif values["progress"] > 0:
+                values["status"] = "reading"
         async with self._session_factory() as session:
-            item = await session.get(LearningItem, item_id)
-            if not item:
-                return None
-            for key, value in kwargs.items():
-                if hasattr(item, key) and value is not None:
-                    setattr(item, key, value)
-            # Auto-update status based on progress
-            if item.progress >= 100:
-                item.progress = 100
-                item.status = "completed"
-            elif item.progress > 0:
-                item.status = "reading"
+            if not values:
+                return await session.get(LearningItem, item_id)
+            result = await session.execute(
+                update(LearningItem)
+                .where(LearningItem.id == item_id)
+                .values(**values)
+                .returning(LearningItem)
+            )
+            item = result.scalar_one_or_none()
             await session.commit()
-            await session.refresh(item)
             return item
 
     async def delete_item(self, item_id: str) -> str | None:
@@ -7,10 +7,18 @@ Updated: storage.search() is now async.
 from dataclasses import dataclass
 
 from ..providers.embedding import EmbeddingProvider
+from ..providers.embedding.cache import (
+    SemanticCache,
+    l2_get_search,
+    l2_put_search,
+    text_key,
+)
 from ..providers.storage import StorageProvider
 
 
-@dataclass
+# slots=True: these are built per result row on every search; slotted
+# instances skip the per-object __dict__ and construct faster
+@dataclass(slots=True)
 class SearchResultItem:
     """Search result item with all details."""
 
@@ -19,6 +27,14 @@ class SearchResultItem:
     score: float
     metadata: dict
 
+    def as_dict(self) -> dict:
+        return {
+            "content": self.content,
+            "source": self.source,
+            "score": self.score,
+            "metadata": self.metadata,
+        }
+
 
 class SearchService:
     """Service for semantic search operations."""
@@ -30,6 +46,8 @@ class SearchService:
     ):
         self._embedding = embedding_provider
         self._storage = storage_provider
+        # Lazily sized from the first query vector (dimension may need an API call)
+        self._semantic_cache: SemanticCache | None = None
 
     async def search(
         self,
@@ -38,10 +56,26 @@ class SearchService:
         filter_metadata: dict | None = None,
     ) -> list[SearchResultItem]:
         """Search for similar documents."""
-        if not query or not query.strip():
+        query = query.strip() if query else ""
+        if not query:
             return []
 
-        query_embedding = await self._embedding.embed(query.strip())
+        query_embedding = await self._embedding.embed(query)
+
+        # Filtered searches bypass the cache — entries are keyed by vector only
+        use_cache = filter_metadata is None
+        if use_cache:
+            if self._semantic_cache is None:
+                self._semantic_cache = SemanticCache(dimension=len(query_embedding))
+            cached = self._semantic_cache.get(query_embedding)
+            if cached is not None and len(cached) >= top_k:
+                return cached[:top_k]
+
+            # Shared L2 (Redis) — a peer worker may have run this search
+            l2_key = f"{self._embedding.model_name}:{text_key(query)}:{top_k}"
+            l2_hit = await l2_get_search(l2_key)
+            if l2_hit is not None:
+                return [SearchResultItem(**item) for item in l2_hit]
 
         results = await self._storage.search(
             query_embedding=query_embedding,
@@ -49,7 +83,7 @@ class SearchService:
             filter_metadata=filter_metadata,
         )
 
-        return [
+        items = [
             SearchResultItem(
                 content=r.content,
                 source=r.metadata.get("source", "unknown"),
@@ -59,6 +93,51 @@ class SearchService:
             for r in results
         ]
 
+        if use_cache:
+            self._semantic_cache.put(query_embedding, items)
+            await l2_put_search(l2_key, [item.as_dict() for item in items])
+
+        return items
+
+    async def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+    ) -> list[list[SearchResultItem]]:
+        """Batch variant of search: one embed_batch call, one storage round-trip.
+
+        Useful when a single turn produces several tool queries — N embedding
+        API calls collapse into one, and pgvector answers all arms in a single
+        UNION ALL statement. Results come back positionally aligned with
+        ``queries``; blank queries yield empty lists.
+        """
+        results: list[list[SearchResultItem]] = [[] for _ in queries]
+        live = [(i, s) for i, q in enumerate(queries) if q and (s := q.strip())]
+        if not live:
+            return results
+
+        embeddings = await self._embedding.embed_batch([q for _, q in live])
+
+        if hasattr(self._storage, "search_many"):
+            batches = await self._storage.search_many(embeddings, top_k=top_k)
+        else:
+            batches = [
+                await self._storage.search(query_embedding=e, top_k=top_k)
+                for e in embeddings
+            ]
+
+        for (i, _), batch in zip(live, batches):
+            results[i] = [
+                SearchResultItem(
+                    content=r.content,
+                    source=r.metadata.get("source", "unknown"),
+                    score=r.score,
+                    metadata=r.metadata,
+                )
+                for r in batch
+            ]
+        return results
+
     async def search_by_doc_id(
         self,
         query: str,
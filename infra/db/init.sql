@@ -21,18 +21,27 @@ CREATE TABLE documents (
 CREATE INDEX ix_documents_status ON documents (status);
 
 -- 知识库 chunks（向量 + 内容）
+-- halfvec (fp16): 存储和索引扫描带宽减半，top-k 余弦排序精度足够
 CREATE TABLE chunks (
     id TEXT PRIMARY KEY,
     content TEXT NOT NULL,
-    embedding vector(1024),
+    embedding halfvec(1024),
     doc_id TEXT NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
     source TEXT,
     chunk_index INTEGER,
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
-CREATE INDEX ix_chunks_embedding ON chunks USING hnsw (embedding vector_cosine_ops);
+-- STORAGE MAIN: 向量内联存储(仅压缩不落 TOAST), 距离扫描少一次页面读取
+ALTER TABLE chunks ALTER COLUMN embedding SET STORAGE MAIN;
+
+-- m/ef_construction 调高换取更好的召回率; 查询侧 ef_search 由后端按 top_k 设置
+CREATE INDEX ix_chunks_embedding ON chunks USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 100);
+-- 已有库的迁移见 migrations/001_halfvec.sql
 CREATE INDEX ix_chunks_doc_id ON chunks (doc_id);
+-- metadata 过滤走 JSONB 包含查询 (@>), jsonb_path_ops 比默认 ops 更小更快
+CREATE INDEX ix_chunks_metadata_gin ON chunks USING gin (metadata jsonb_path_ops);
 
 -- 学习进度
 CREATE TABLE learning_items (
@@ -0,0 +1,18 @@
+-- 001: chunks.embedding vector(1024) -> halfvec(1024)
+-- 针对在 halfvec 之前初始化的数据库; 新库由 init.sql 直接建为 halfvec。
+-- fp16 存储减半、HNSW 扫描带宽减半, top-k 余弦排序精度足够。
+
+BEGIN;
+
+DROP INDEX IF EXISTS ix_chunks_embedding;
+
+ALTER TABLE chunks
+    ALTER COLUMN embedding TYPE halfvec(1024)
+    USING embedding::halfvec(1024);
+
+COMMIT;
+
+-- 索引重建放在事务外, 便于调大 maintenance_work_mem
+SET maintenance_work_mem = '512MB';
+CREATE INDEX ix_chunks_embedding ON chunks USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 100);
@@ -0,0 +1,9 @@
+-- 002: chunks.embedding 改为 STORAGE MAIN
+-- 默认 EXTENDED 会把 ~2KB 的向量 TOAST 到行外, 距离扫描每行多一次页面读取。
+-- MAIN 只压缩不落 TOAST; 配合 halfvec(001) 行内存储有保证。
+-- 注意: 已有行保持旧存储方式, 需要重写表才生效。
+
+ALTER TABLE chunks ALTER COLUMN embedding SET STORAGE MAIN;
+
+-- 重写已有行 (锁表, 选低峰期执行):
+VACUUM FULL chunks;
@@ -0,0 +1,6 @@
+-- 003: chunks.metadata 增加 GIN 索引
+-- 过滤搜索按 JSONB 包含 (@>) 下推到索引, 距离扫描只看命中的候选。
+-- jsonb_path_ops 只支持 @> 但索引更小、查得更快, 够用。
+
+CREATE INDEX IF NOT EXISTS ix_chunks_metadata_gin
+    ON chunks USING gin (metadata jsonb_path_ops);